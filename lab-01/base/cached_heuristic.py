@@ -0,0 +1,107 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Sequence, TypeVar
+
+from base.heuristic import Heuristic
+from base.problem import EncodableProblem, Problem
+from base.state import State
+
+
+S = TypeVar('S', bound=State)
+DEFAULT_CAPACITY = 1_000_000
+
+
+class CachedHeuristic(Heuristic[S], Generic[S]):
+    """
+    Heuristic memoizing the values of the wrapped one, otherwise works as the wrapped heuristic.
+    Pays off for the expensive heuristics evaluating the same states again and again
+    (states regenerated from different parents, reopened, revisited by IDA* or by both sides of a bidirectional search).
+
+    At most `capacity` values are kept, the least recently used one is evicted first.
+    The values are keyed by the state itself (its hash and equality), or by the `key` of the state if it's given,
+    e.g. by the compact binary encoding of an :class:`EncodableProblem`, so the cache doesn't keep the states alive.
+
+    Attributes:
+    ===========
+    hits: int
+        evaluations answered from the cache
+    misses: int
+        evaluations passed to the wrapped heuristic
+
+    >>> from base.heuristic import NoHeuristic
+    >>> cache = CachedHeuristic(NoHeuristic(), capacity=2)
+    >>> cache.batch(["a", "b"])
+    [0, 0]
+    >>> cache("a"), cache("c"), cache("b")  # "c" evicts "b", the least recently used one
+    (0, 0, 0)
+    >>> cache.report()
+    {'entries': 2, 'hits': 1, 'misses': 4, 'hit_rate': 0.2}
+    """
+
+    def __init__(self, heuristic: Heuristic[S], capacity: int = DEFAULT_CAPACITY,
+                 key: Callable[[S], Hashable] | None = None):
+        self.heuristic = heuristic
+        self.capacity = capacity
+        self.key = key
+        self.values: OrderedDict[Hashable, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, state: S) -> float:
+        key = self.key(state) if self.key is not None else state
+        values = self.values
+        value = values.get(key)
+        if value is not None:
+            values.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = self.heuristic(state)
+        self._store(key, value)
+        return value
+
+    def batch(self, states: Sequence[S]) -> Sequence[float]:
+        """ answers what it can from the cache, the missing states are passed to the wrapped heuristic at once """
+        keys = [self.key(state) for state in states] if self.key is not None else states
+        values, move_to_end = self.values, self.values.move_to_end
+        result: list[Any] = [values.get(key) for key in keys]
+        missing = [i for i, value in enumerate(result) if value is None]
+        for i, value in enumerate(result):
+            if value is not None:
+                move_to_end(keys[i])
+        self.hits += len(states) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = self.heuristic.batch([states[i] for i in missing])
+            for i, value in zip(missing, computed):
+                result[i] = value
+                self._store(keys[i], value)
+        return result
+
+    def _store(self, key: Hashable, value: float) -> None:
+        values = self.values
+        values[key] = value
+        if len(values) > self.capacity:
+            values.popitem(last=False)
+
+    def report(self) -> dict[str, Any]:
+        """ summary of the cache usage ready to be serialized to JSON """
+        return cache_report([self])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.heuristic, name)
+
+
+def cache_report(caches: Sequence[CachedHeuristic]) -> dict[str, Any]:
+    """ summary of the usage of the caches together (e.g. of both heuristics of a bidirectional search) """
+    hits = sum(cache.hits for cache in caches)
+    misses = sum(cache.misses for cache in caches)
+    return {"entries": sum(len(cache.values) for cache in caches),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else None}
+
+
+def cached(heuristic: Heuristic[S], problem: Problem[S, Any], capacity: int = DEFAULT_CAPACITY) -> CachedHeuristic[S]:
+    """ wraps the heuristic in a cache, the states of an encodable problem are cached by their encoding """
+    return CachedHeuristic(heuristic, capacity, problem.encode if isinstance(problem, EncodableProblem) else None)
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from base import State, Problem
 
-from typing import TypeVar, Generic, Any, cast
+from typing import TypeVar, Generic, Any, Sequence, cast
 
 S = TypeVar('S', bound=State)
 
@@ -18,6 +18,12 @@ class Heuristic(ABC, Generic[S]):
         this method should use to precalculate helper functions
     __call__(state: S) -> float:
         calculates approximiate distance from the given state to the goal
+
+    Methods:
+    ========
+    batch(states: Sequence[S]) -> Sequence[float]:
+        calculates the distances of many states at once (e.g. all the children of an expanded node),
+        evaluates them one by one, unless the heuristic provides a vectorized version
     """
 
     @abstractmethod
@@ -30,6 +36,10 @@ class Heuristic(ABC, Generic[S]):
     def __call__(self, state: S) -> float:
         """ calculates approximiate distance from the given state to the goal """
 
+    def batch(self, states: Sequence[S]) -> Sequence[float]:
+        """ calculates approximiate distances from the given states to the goal, in the same order """
+        return [self(state) for state in states]
+
 
 class NoHeuristic(Heuristic[S]):
     """
@@ -41,3 +51,6 @@ class NoHeuristic(Heuristic[S]):
 
     def __call__(self, state: S) -> float:
         return 0
+
+    def batch(self, states: Sequence[S]) -> Sequence[float]:
+        return [0] * len(states)
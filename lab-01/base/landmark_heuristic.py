@@ -0,0 +1,106 @@
+from __future__ import annotations
+import heapq
+from itertools import count
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+from base.heuristic import Heuristic
+from base.problem import Problem, ReversibleProblem
+from base.state import State
+
+
+S = TypeVar('S', bound=State)
+DEFAULT_LANDMARKS = 4
+
+
+def dijkstra(problem: Problem[S, Any], source: S) -> dict[S, float]:
+    """ returns distances from the source to all the states reachable from it """
+    distances = {source: 0.0}
+    tie_breaker = count()
+    queue: list[tuple[float, int, S]] = [(0.0, next(tie_breaker), source)]
+    while queue:
+        distance, _, state = heapq.heappop(queue)
+        if distance > distances[state]:
+            continue
+        for action in problem.actions(state):
+            child = problem.take_action(state, action)
+            child_distance = distance + problem.action_cost(state, action)
+            if child_distance < distances.get(child, float('inf')):
+                distances[child] = child_distance
+                heapq.heappush(queue, (child_distance, next(tie_breaker), child))
+    return distances
+
+
+class LandmarkTable(Generic[S]):
+    """
+    Distances between the chosen landmark states and every state connected with the goal.
+
+    The table doesn't depend on the initial state and goal of the problem it was built for,
+    so it can be shared by any problem over the same state space (e.g. queries on the same map).
+    Action costs are assumed to be symmetric, i.e. undoing an action costs the same as taking it.
+
+    Attributes:
+    ===========
+    landmarks: list[S]
+        the chosen landmarks
+    index: dict[S, int]
+        row of each known state in the `distances`
+    distances: NDArray[np.float64]
+        `distances[index[state], i]` is the distance between the state and the i-th landmark
+    """
+
+    def __init__(self, landmarks: list[S], index: dict[S, int], distances: NDArray[np.float64]):
+        self.landmarks = landmarks
+        self.index = index
+        self.distances = distances
+
+    @staticmethod
+    def build(problem: ReversibleProblem[S, Any], k: int = DEFAULT_LANDMARKS) -> LandmarkTable[S]:
+        """
+        Farthest-point selection: the first landmark is the state farthest from the goal,
+        every next one is the state farthest from its closest already chosen landmark.
+        Each landmark costs a full Dijkstra run over the state space.
+        """
+        from_goal = dijkstra(problem, problem.goal)
+        states = list(from_goal)
+        index = {state: i for i, state in enumerate(states)}
+        distances = np.empty((len(states), k), dtype=np.float64)
+
+        landmarks: list[S] = []
+        closest = np.array([from_goal[state] for state in states])
+        while len(landmarks) < k:
+            farthest = int(np.argmax(closest))
+            if closest[farthest] <= 0 and landmarks:
+                break
+            landmarks.append(states[farthest])
+            from_landmark = dijkstra(problem, states[farthest])
+            column = np.array([from_landmark.get(state, np.inf) for state in states])
+            distances[:, len(landmarks) - 1] = column
+            closest = column if len(landmarks) == 1 else np.minimum(closest, column)
+        return LandmarkTable(landmarks, index, distances[:, :len(landmarks)])
+
+
+class LandmarkHeuristic(Heuristic[S]):
+    """
+    ALT (A*, landmarks, triangle inequality) heuristic for the reversible problems.
+
+    For every landmark L the triangle inequality gives |d(L, goal) - d(L, state)| <= d(state, goal),
+    the heuristic takes the best of these bounds. Unlike the geometric heuristics it knows
+    about the obstacles, e.g. walls between the state and the goal.
+    Pass an already built `landmarks` table to reuse it for another start/goal pair.
+    """
+
+    def __init__(self, problem: ReversibleProblem[S, Any], landmarks: LandmarkTable[S] | None = None,
+                 k: int = DEFAULT_LANDMARKS):
+        self.problem = problem
+        self.landmarks = landmarks if landmarks is not None else LandmarkTable.build(problem, k)
+        goal = self.landmarks.index.get(problem.goal)
+        self.goal_distances = None if goal is None else self.landmarks.distances[goal]
+
+    def __call__(self, state: S) -> float:
+        row = self.landmarks.index.get(state)
+        if row is None or self.goal_distances is None:
+            return 0.0
+        return float(np.abs(self.goal_distances - self.landmarks.distances[row]).max())
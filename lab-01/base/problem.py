@@ -1,8 +1,11 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from base.state import State
-from typing import TypeVar, Generic
-from PIL.Image import Image
+from typing import TYPE_CHECKING, TypeVar, Generic
+
+if TYPE_CHECKING:
+    # only for the annotations, PIL is imported by the problems drawing their states
+    from PIL.Image import Image
 
 """
 Type variabiles used to define the generic types.
@@ -95,4 +98,38 @@ class ReversibleProblem(Problem[S,A], ABC, Generic[S,A]):
 
     @abstractmethod
     def reversed(self) -> ReversibleProblem[S, A]:
-        """ returns problem with swapped initial and goal states """
\ No newline at end of file
+        """ returns problem with swapped initial and goal states """
+
+
+class EncodableProblem(Problem[S, A], ABC, Generic[S, A]):
+    """
+    Interface for the problems whose states have a fixed-width binary encoding,
+    so they can be stored compactly outside of the memory (e.g. by the external-memory solvers).
+
+    The encoding has to be one-to-one: equal states are encoded as equal bytes and vice versa.
+
+    Abstract Properties:
+    ====================
+        state_size: int
+            number of bytes of every encoded state
+
+    Abstract Methods:
+    =================
+        encode(state: S) -> bytes:
+            returns `state_size` bytes representing the given state
+        decode(data: bytes) -> S:
+            restores the state from its encoding
+    """
+
+    @property
+    @abstractmethod
+    def state_size(self) -> int:
+        """ number of bytes of every encoded state """
+
+    @abstractmethod
+    def encode(self, state: S) -> bytes:
+        """ returns `state_size` bytes representing the given state """
+
+    @abstractmethod
+    def decode(self, data: bytes) -> S:
+        """ restores the state from its encoding """
@@ -65,6 +65,27 @@ class HeuristicSolver(Solver[P], ABC, Generic[P, H]):
         self.heuristic = heuristic
 
 
+class AnytimeHeuristicSolver(HeuristicSolver[P, H], ABC, Generic[P, H]):
+    """
+    Works same as :class:`HeuristicSolver`, but finds a (suboptimal) solution quickly
+    and keeps improving it, so it's worth reading the best solution found so far,
+    even if the solver was interrupted.
+
+    Attributes:
+    ==========
+        incumbent: Node | None
+            the best solution found so far
+        bound: float
+            the incumbent costs at most `bound` times as much as the optimal solution
+            (for an admissible heuristic), infinity until a solution is found
+    """
+
+    def __init__(self, problem: P, heuristic: H):
+        super().__init__(problem, heuristic)
+        self.incumbent: Node | None = None
+        self.bound = float('inf')
+
+
 class BidirectionalHeuristicSolver(Solver[B], ABC, Generic[B, H]):
     """
     Works same as :class:`Solver`, but uses a heuristic function 
@@ -1,22 +1,33 @@
 import traceback
 import stopit
 import argparse
+from base.cached_heuristic import CachedHeuristic, cache_report, cached
 from base.problem import ReversibleProblem
-from cli_config import VERSION, avl_algos, avl_problems, problem_heuristics
+from cli_config import VERSION, applicable, avl_algos, avl_problems, heuristic_classes
 from typing import Union
-from base.solver import BidirectionalHeuristicSolver, HeuristicSolver, Solver
+from base.solver import AnytimeHeuristicSolver, BidirectionalHeuristicSolver, HeuristicSolver, Solver
 from tree.node import Node
 
 from pathlib import Path
+from tree.profile import SearchProfile, ProfiledHeuristic, unwrap_heuristic
 from tree.tree import NodeEvent, NodeEventSubscriber, Tree
+import json
 import time
 
 
+""" how often (in seconds) the monitors refresh the printed stats """
+STATS_INTERVAL = 0.1
+
+
 class BenchmarkMonitor(NodeEventSubscriber, Solver):
-    def __init__(self, solver: Solver, longest_name: int, timeout: float) -> None:
+    def __init__(self, solver: Solver, longest_name: int, timeout: float,
+                 heuristic_caches: list[CachedHeuristic] | None = None) -> None:
         super().__init__(solver.problem)
         self.solver = solver
-        self.solver.search_tree().subscribe(self)
+        self.heuristic_caches = heuristic_caches or []
+        self.tree = solver.search_tree()
+        self.stats = self.tree.enable_stats()
+        self.tree.subscribe(self, interval=STATS_INTERVAL)
         self._reset_stats()
         self.longest_name = longest_name
         self.timeout = timeout
@@ -31,25 +42,31 @@ class BenchmarkMonitor(NodeEventSubscriber, Solver):
             result = self.solve_with_timeout(timeout=self.timeout)
         except RecursionError:
             result = "recursion stack overflow"
+        if result == 'timeout' and isinstance(self.solver, AnytimeHeuristicSolver) and self.solver.incumbent is not None:
+            result = f"{self.solver.incumbent.cost} (timeout, at most {self.solver.bound:.2f}x optimal)"
 
+        self.wall_time = time.time() - self.start_time
+        self.print_stats()
         self.print_result(result)
         return result
 
     def search_tree(self) -> Tree:
-        return self.solver.search_tree()
+        return self.tree
 
     def _reset_stats(self):
         self.start_time = time.time()
-        self.closed_nodes = 0
-        self.opened_nodes = 1
+        self.stats.reset()
         self.wall_time = 0
 
+    @property
+    def closed_nodes(self) -> int:
+        return self.stats.closed
+
+    @property
+    def opened_nodes(self) -> int:
+        return 1 + self.stats.opened - self.stats.closed
+
     def got_event(self, node: Node, event: NodeEvent) -> None:
-        if event == NodeEvent.Closed:
-            self.closed_nodes += 1
-            self.opened_nodes -= 1
-        elif event == NodeEvent.Opened:
-            self.opened_nodes += 1
         self.wall_time = time.time() - self.start_time
         self.print_stats()
 
@@ -58,9 +75,9 @@ class BenchmarkMonitor(NodeEventSubscriber, Solver):
 
     def _heuristic_name(self) -> str | None:
         if isinstance(self.solver, HeuristicSolver):
-            return self.solver.heuristic.__class__.__name__
+            return unwrap_heuristic(self.solver.heuristic).__class__.__name__
         if isinstance(self.solver, BidirectionalHeuristicSolver):
-            return self.solver.primary_heuristic.__class__.__name__
+            return unwrap_heuristic(self.solver.primary_heuristic).__class__.__name__
         else:
             return None
 
@@ -71,12 +88,27 @@ class BenchmarkMonitor(NodeEventSubscriber, Solver):
         print(f"\r{solver_name: >{self.longest_name}} | {self.opened_nodes:<9} | {self.closed_nodes:<9} | {self.wall_time:<8.2f} |", end='', flush=True)
 
     def print_result(self, result: Union[str,Node | None]):
+        cache = ""
+        if self.heuristic_caches:
+            hit_rate = cache_report(self.heuristic_caches)["hit_rate"]
+            cache = f" (cache hit rate {hit_rate:.1%})" if hit_rate is not None else ""
         if result is None:
-            print(" fail")
+            print(f" fail{cache}")
         elif isinstance(result, str):
-            print(f" {result}")
+            print(f" {result}{cache}")
         else:
-            print(f" {result.cost}")
+            print(f" {result.cost}{cache}")
+
+    def write_profile(self, profile_file, profile: SearchProfile, instance: str, result: Union[str, Node | None]):
+        """ appends the profile of the last run as a JSON line """
+        report = {"problem": self.problem.__class__.__name__,
+                  "instance": Path(instance).stem,
+                  "algorithm": self._solver_name(),
+                  "heuristic": self._heuristic_name(),
+                  "result": result.cost if isinstance(result, Node) else result or "fail",
+                  **profile.report(self.wall_time, result if isinstance(result, Node) else None)}
+        profile_file.write(json.dumps(report) + "\n")
+        profile_file.flush()
 
 
 def print_header(problem_class, instance, timeout, longest_name):
@@ -96,6 +128,10 @@ def parse_args():
                         help="name of the problem type corresponding to the given instance")
     parser.add_argument("-t", "--timeout", type=int, default=30.0,
                         help="how long each algorithm is allowed to work")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="file to write the per-phase search profiles (JSON lines) to")
+    parser.add_argument("--heuristic-cache", metavar="ENTRIES", type=int, default=0,
+                        help="memoize up to that many heuristic values (least recently used are evicted)")
     return parser.parse_args()
 
 
@@ -117,11 +153,13 @@ if __name__ == "__main__":
         print("> Failed to load the instance, are you sure, you've chosen correct problem type?")
         exit(-1)
 
+    heuristics = heuristic_classes(args.problem)
     longest_name = max([len(a.__name__) + len(h.__name__)
                         for a in avl_algos.values()
-                        for h in problem_heuristics[problem_class]]) + 2
+                        for h in heuristics]) + 2
     print_header(problem_class, instance, timeout, longest_name)
-    for algorithm_class in avl_algos.values():
+    profile_file = open(args.profile, "w") if args.profile else None
+    for algorithm_name, algorithm_class in avl_algos.items():
         algorithm:Solver | None = None
         requires_heuristic = issubclass(algorithm_class, HeuristicSolver)\
             or issubclass(algorithm_class, BidirectionalHeuristicSolver)
@@ -130,8 +168,11 @@ if __name__ == "__main__":
         if requires_reversing and not isinstance(problem, ReversibleProblem):
             continue
 
+        if not applicable(algorithm_name, args.problem):
+            continue
+
         if requires_heuristic:
-            for heuristic_class in sorted(list(problem_heuristics[problem_class]), key = lambda x: x.__name__):
+            for heuristic_class in heuristics:
                 solver_name = f"{algorithm_class.__name__}({heuristic_class.__name__})"
                 try:
                     heuristic = heuristic_class(problem)
@@ -146,17 +187,36 @@ if __name__ == "__main__":
                     continue
 
                 try:
+                    profile = SearchProfile() if profile_file else None
+                    solved_problem = profile.instrument(problem) if profile is not None else problem
+                    heuristic_caches: list[CachedHeuristic] = []
+                    if args.heuristic_cache > 0:
+                        heuristic = cached(heuristic, problem, args.heuristic_cache)
+                        heuristic_caches.append(heuristic)
                     if requires_reversing:
                         assert isinstance(problem, ReversibleProblem)
                         assert issubclass(algorithm_class, BidirectionalHeuristicSolver)
                         opposite_heuristic = heuristic_class(problem.reversed())
-                        algorithm = algorithm_class(problem, heuristic, opposite_heuristic)
+                        if args.heuristic_cache > 0:
+                            opposite_heuristic = cached(opposite_heuristic, problem, args.heuristic_cache)
+                            heuristic_caches.append(opposite_heuristic)
+                        if profile is not None:
+                            heuristic = ProfiledHeuristic(heuristic, profile)
+                            opposite_heuristic = ProfiledHeuristic(opposite_heuristic, profile)
+                        algorithm = algorithm_class(solved_problem, heuristic, opposite_heuristic)
                     else:
                         assert issubclass(algorithm_class, HeuristicSolver)
-                        algorithm = algorithm_class(problem, heuristic)
+                        if profile is not None:
+                            heuristic = ProfiledHeuristic(heuristic, profile)
+                        algorithm = algorithm_class(solved_problem, heuristic)
+                    if profile is not None:
+                        algorithm.search_tree().enable_profile(profile)
+                        profile.heuristic_caches = heuristic_caches
                     solver_monitor = BenchmarkMonitor(
-                        algorithm, longest_name, timeout)
-                    solver_monitor.solve()
+                        algorithm, longest_name, timeout, heuristic_caches)
+                    result = solver_monitor.solve()
+                    if profile is not None:
+                        solver_monitor.write_profile(profile_file, profile, instance, result)
                 except NotImplementedError as e:
                     print(
                         f"{solver_name: >{longest_name}} | algorithm is not implemented yet")
@@ -166,13 +226,21 @@ if __name__ == "__main__":
         else:
             solver_name = algorithm_class.__name__
             try:
-                algorithm = algorithm_class(problem)
+                profile = SearchProfile() if profile_file else None
+                algorithm = algorithm_class(profile.instrument(problem) if profile is not None else problem)
+                if profile is not None:
+                    algorithm.search_tree().enable_profile(profile)
                 solver_monitor = BenchmarkMonitor(
                     algorithm, longest_name, timeout)
-                solver_monitor.solve()
+                result = solver_monitor.solve()
+                if profile is not None:
+                    solver_monitor.write_profile(profile_file, profile, instance, result)
             except NotImplementedError as e:
                 print(
                     f"{solver_name: >{longest_name}} | algorithm is not implemented yet")
             except Exception as e:
                 print(
                     f"{solver_name: >{longest_name}} | algorithm raised an error {e}")
+
+    if profile_file is not None:
+        profile_file.close()
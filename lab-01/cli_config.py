@@ -1,31 +1,17 @@
 import re
-from typing import Type, cast
+from typing import Type
 from base.problem import Problem, ReversibleProblem
 from base.heuristic import Heuristic
 from base.solver import Solver
-from problems.blocks_world.blocks_world_heuristic import BlocksWorldNaiveHeuristic
-from problems.blocks_world.blocks_world_problem import BlocksWorldProblem
+from utils.registry import LazyRegistry
 
-from problems.n_puzzle.n_puzzle_problem import NPuzzleProblem
-from problems.n_puzzle.heuristics.n_puzzle_manhattan_heuristic import NPuzzleManhattanHeuristic
-from problems.n_puzzle.heuristics.n_puzzle_tiles_out_of_place_heuristic import NPuzzleTilesOutOfPlaceHeuristic
 
-from problems.grid_pathfinding.grid_pathfinding import GridPathfinding
-from problems.grid_pathfinding.heuristics.manhattan_heuristic import GridManhattanHeuristic
-from problems.grid_pathfinding.heuristics.euclidean_heuristic import GridEuclideanHeuristic
-from problems.grid_pathfinding.heuristics.diagonal_heuristic import GridDiagonalHeuristic
-from problems.rush_hour.heuristics.indirect_heuristic import RushHourIndirectHeuristic
-
-from problems.rush_hour.rush_hour import RushHourProblem
-from problems.rush_hour.heuristics.blocking_cars_heuristic import RushHourBlockingCarsHeuristic
-from problems.rush_hour.heuristics.distance_to_exit_heuristic import RushHourDistanceToExitHeuristic
-
-from problems.pancake.pancake_problem import PancakeProblem
-from problems.pancake.heuristics.gap_heuristic import PancakeGapHeuristic
-from problems.pancake.heuristics.largest_pancake_heuristic import PancakeLargestPancakeHeuristic
-
-from solvers import BFS, DFSIter, DFSRecursive, Dijkstra, Greedy, AStar
-from solvers.new_bidrectional_astar import NBAstar
+"""
+Problems, heuristics and algorithms available in the CLI, listed by the paths of their modules,
+so a module is imported only if its class is actually used (see :class:`LazyRegistry`).
+The names follow the class names: snake case without the "Problem"/"Heuristic" suffix
+for the problems and heuristics (see `camel_to_snake`), lowercase class names for the algorithms.
+"""
 
 
 VERSION = "0.42.1 — Lazy Leviathan"
@@ -40,23 +26,87 @@ def camel_to_snake(camel: str, useless_suffix: str = '') -> str:
     return re.sub(r'(?<!^)(?=[A-Z])', '_', useful_camel).lower()
 
 
-problem_heuristics: dict[Type[Problem], set[Type[Heuristic]]] = {
-    GridPathfinding: {GridEuclideanHeuristic, GridDiagonalHeuristic, GridManhattanHeuristic},
-    NPuzzleProblem: {NPuzzleTilesOutOfPlaceHeuristic, NPuzzleManhattanHeuristic},
-    RushHourProblem: {RushHourDistanceToExitHeuristic, RushHourBlockingCarsHeuristic, RushHourIndirectHeuristic},
-    BlocksWorldProblem: {BlocksWorldNaiveHeuristic},
-    PancakeProblem: {PancakeGapHeuristic, PancakeLargestPancakeHeuristic}
+avl_problems: LazyRegistry[Type[Problem]] = LazyRegistry({
+    "grid_pathfinding": "problems.grid_pathfinding.grid_pathfinding:GridPathfinding",
+    "n_puzzle": "problems.n_puzzle.n_puzzle_problem:NPuzzleProblem",
+    "rush_hour": "problems.rush_hour.rush_hour:RushHourProblem",
+    "blocks_world": "problems.blocks_world.blocks_world_problem:BlocksWorldProblem",
+    "pancake": "problems.pancake.pancake_problem:PancakeProblem",
+})
+
+avl_heuristics: LazyRegistry[Type[Heuristic]] = LazyRegistry({
+    "grid_euclidean": "problems.grid_pathfinding.heuristics.euclidean_heuristic:GridEuclideanHeuristic",
+    "grid_diagonal": "problems.grid_pathfinding.heuristics.diagonal_heuristic:GridDiagonalHeuristic",
+    "grid_manhattan": "problems.grid_pathfinding.heuristics.manhattan_heuristic:GridManhattanHeuristic",
+    "grid_landmark": "problems.grid_pathfinding.heuristics.landmark_heuristic:GridLandmarkHeuristic",
+    "n_puzzle_tiles_out_of_place": "problems.n_puzzle.heuristics.n_puzzle_tiles_out_of_place_heuristic:NPuzzleTilesOutOfPlaceHeuristic",
+    "n_puzzle_manhattan": "problems.n_puzzle.heuristics.n_puzzle_manhattan_heuristic:NPuzzleManhattanHeuristic",
+    "n_puzzle_pattern_database": "problems.n_puzzle.heuristics.n_puzzle_pattern_database_heuristic:NPuzzlePatternDatabaseHeuristic",
+    "rush_hour_distance_to_exit": "problems.rush_hour.heuristics.distance_to_exit_heuristic:RushHourDistanceToExitHeuristic",
+    "rush_hour_blocking_cars": "problems.rush_hour.heuristics.blocking_cars_heuristic:RushHourBlockingCarsHeuristic",
+    "rush_hour_indirect": "problems.rush_hour.heuristics.indirect_heuristic:RushHourIndirectHeuristic",
+    "rush_hour_database": "problems.rush_hour.heuristics.database_heuristic:RushHourDatabaseHeuristic",
+    "blocks_world_naive": "problems.blocks_world.blocks_world_heuristic:BlocksWorldNaiveHeuristic",
+    "pancake_gap": "problems.pancake.heuristics.gap_heuristic:PancakeGapHeuristic",
+    "pancake_largest_pancake": "problems.pancake.heuristics.largest_pancake_heuristic:PancakeLargestPancakeHeuristic",
+})
+
+avl_algos: LazyRegistry[Type[Solver]] = LazyRegistry({
+    "dfsrecursive": "solvers.depth_first_recursive:DFSRecursive",
+    "dfsiter": "solvers.depth_first_iter:DFSIter",
+    "iddfs": "solvers.depth_first:IDDFS",
+    "bfs": "solvers.breadth_first:BFS",
+    "externalbfs": "solvers.external_breadth_first:ExternalBFS",
+    "dijkstra": "solvers.dijkstra:Dijkstra",
+    "greedy": "solvers.greedy:Greedy",
+    "astar": "solvers.astar:AStar",
+    "weightedastar": "solvers.weighted_astar:WeightedAStar",
+    "arastar": "solvers.anytime_astar:ARAStar",
+    "hdastar": "solvers.hda_star:HDAStar",
+    "beam": "solvers.beam_search:Beam",
+    "breadthfirstbeam": "solvers.beam_search:BreadthFirstBeam",
+    "idastar": "solvers.idastar:IDAStar",
+    "nbastar": "solvers.new_bidrectional_astar:NBAstar",
+    "jps": "solvers.jump_point_search:JPS",
+    "rushhourlookup": "solvers.rush_hour_lookup:RushHourLookup",
+})
+
+""" names of the heuristics applicable to every problem """
+problem_heuristics: dict[str, list[str]] = {
+    "grid_pathfinding": ["grid_euclidean", "grid_diagonal", "grid_manhattan", "grid_landmark"],
+    "n_puzzle": ["n_puzzle_tiles_out_of_place", "n_puzzle_manhattan", "n_puzzle_pattern_database"],
+    "rush_hour": ["rush_hour_distance_to_exit", "rush_hour_blocking_cars", "rush_hour_indirect", "rush_hour_database"],
+    "blocks_world": ["blocks_world_naive"],
+    "pancake": ["pancake_gap", "pancake_largest_pancake"],
+}
+
+""" names of the problems the specialized algorithms work with, the other algorithms work with all of them """
+algorithm_problems: dict[str, list[str]] = {
+    "jps": ["grid_pathfinding"],
+    "rushhourlookup": ["rush_hour"],
+    # unit costs and few transpositions, on grids (diagonal costs) and Rush Hour it deepens too slowly to finish
+    "idastar": ["n_puzzle", "pancake", "blocks_world"],
+    # the problems implementing EncodableProblem
+    "externalbfs": ["grid_pathfinding", "n_puzzle", "rush_hour", "blocks_world", "pancake"],
 }
 
-avl_problems: dict[str, Type[Problem]] = {camel_to_snake(p.__name__, "Problem"): cast(Type[Problem], p)
-                                          for p in
-                                          [GridPathfinding, NPuzzleProblem, RushHourProblem, BlocksWorldProblem, PancakeProblem]}
-avl_algos: dict[str, Type[Solver]] = {a.__name__.lower(): cast(Type[Solver], a) for a in [
-    DFSRecursive, DFSIter, BFS, Dijkstra, Greedy, AStar, NBAstar]}
-
-all_heuristics: list[Type[Heuristic]] = list(
-    set.union(*problem_heuristics.values()))
-avl_heuristics: dict[str, Type[Heuristic]] = {camel_to_snake(h.__name__, "Heuristic"): cast(Type[Heuristic], h)
-                                              for h in all_heuristics}
-avl_reversible_problems: list[str] = [problem_name for problem_name, problem_class in avl_problems.items()
-                                      if issubclass(problem_class, ReversibleProblem)]
+""" names of the algorithms accepting a second, expensive heuristic evaluated lazily (see `BestFirstSearch`) """
+lazy_heuristic_algorithms: list[str] = ["astar", "weightedastar"]
+
+""" names of the beam searches, accepting the width of the beam and the number of the layers to give up after """
+beam_algorithms: list[str] = ["beam", "breadthfirstbeam"]
+
+
+def applicable(algorithm: str, problem: str) -> bool:
+    """ checks if the (possibly specialized) algorithm works with the problem, by their names """
+    return algorithm not in algorithm_problems or problem in algorithm_problems[algorithm]
+
+
+def heuristic_classes(problem: str) -> list[Type[Heuristic]]:
+    """ classes of the heuristics applicable to the problem (imports them), sorted by the class name """
+    return sorted((avl_heuristics[name] for name in problem_heuristics[problem]), key=lambda h: h.__name__)
+
+
+def reversible_problems() -> list[str]:
+    """ names of the reversible problems (imports all the problems) """
+    return [name for name, problem_class in avl_problems.items() if issubclass(problem_class, ReversibleProblem)]
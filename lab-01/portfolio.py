@@ -0,0 +1,266 @@
+import argparse
+import csv
+import json
+import os
+import resource
+import signal
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
+from multiprocessing import Pool
+from pathlib import Path
+from typing import IO, Iterator, Type
+
+from base.heuristic import Heuristic
+from base.problem import Problem, ReversibleProblem
+from base.solver import AnytimeHeuristicSolver, BidirectionalHeuristicSolver, HeuristicSolver, Solver
+from cli_config import VERSION, applicable, avl_algos, avl_heuristics, avl_problems, problem_heuristics
+
+
+"""
+Parallel benchmark: every (instance, algorithm, heuristic) triple is a separate job
+run in its own worker process, so the jobs use all the cores and can't affect each other.
+The limits are enforced by the worker itself (Unix only):
+- the wall-clock timeout with a timer signal, which interrupts even the CPU-bound Python code,
+- the memory limit by capping the address space of the process (allocations above it raise MemoryError).
+"""
+
+
+@dataclass
+class Job:
+    problem: str
+    instance: str
+    algorithm: str
+    """ name of the algorithm in `avl_algos` """
+    heuristic: str | None
+    """ name of the heuristic in `avl_heuristics` """
+    timeout: float
+    memory_limit: int
+    """ in megabytes """
+
+
+@dataclass
+class JobResult:
+    problem: str
+    instance: str
+    solver: str
+    result: str
+    """ solved / fail / timeout / memory limit / recursion stack overflow / an error message """
+    cost: float | None
+    """ cost of the solution, for a timed out anytime solver the cost of the best solution it found """
+    opened: int
+    closed: int
+    time: float
+    """ solving time in seconds, without loading the instance and building the heuristic """
+    peak_rss: float
+    """ peak resident set size of the worker in megabytes """
+
+
+class JobTimeout(BaseException):
+    """ raised in the worker when the job runs out of time, it's not an Exception so solvers can't swallow it """
+
+
+def solver_name(algorithm_class: Type[Solver], heuristic_class: Type[Heuristic] | None) -> str:
+    if heuristic_class is None:
+        return algorithm_class.__name__
+    return f"{algorithm_class.__name__}({heuristic_class.__name__})"
+
+
+def solver_configurations(problem: str) -> Iterator[tuple[str, str | None]]:
+    """
+    yields the names of the algorithms able to solve the problem along with the names of the heuristics,
+    in the same order as the benchmark
+    """
+    problem_class = avl_problems[problem]
+    heuristic_names = sorted(problem_heuristics[problem], key=lambda name: avl_heuristics[name].__name__)
+    for algorithm_name, algorithm_class in avl_algos.items():
+        requires_heuristic = issubclass(algorithm_class, (HeuristicSolver, BidirectionalHeuristicSolver))
+        requires_reversing = issubclass(algorithm_class, BidirectionalHeuristicSolver)
+        if requires_reversing and not issubclass(problem_class, ReversibleProblem):
+            continue
+        if not applicable(algorithm_name, problem):
+            continue
+        if requires_heuristic:
+            for heuristic_name in heuristic_names:
+                yield algorithm_name, heuristic_name
+        else:
+            yield algorithm_name, None
+
+
+def build_solver(problem: Problem, algorithm_class: Type[Solver], heuristic_class: Type[Heuristic] | None) -> Solver:
+    if heuristic_class is None:
+        return algorithm_class(problem)
+    heuristic = heuristic_class(problem)
+    if issubclass(algorithm_class, BidirectionalHeuristicSolver):
+        assert isinstance(problem, ReversibleProblem)
+        return algorithm_class(problem, heuristic, heuristic_class(problem.reversed()))
+    assert issubclass(algorithm_class, HeuristicSolver)
+    return algorithm_class(problem, heuristic)
+
+
+def run_job(job: Job) -> JobResult:
+    """ runs a single job in the current (worker) process, applying the job limits to the whole process """
+    problem_class = avl_problems[job.problem]
+    algorithm_class = avl_algos[job.algorithm]
+    heuristic_class = avl_heuristics[job.heuristic] if job.heuristic is not None else None
+
+    _limit_memory(job.memory_limit)
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, job.timeout)
+    cost = None
+    solver = None
+    opened = closed = 0
+    start = time.perf_counter()
+    try:
+        with open(job.instance) as instance_file:
+            problem = problem_class.deserialize(instance_file.read())
+        solver = build_solver(problem, algorithm_class, heuristic_class)
+        stats = solver.search_tree().enable_stats()
+        start = time.perf_counter()
+        try:
+            node = solver.solve()
+        finally:
+            opened, closed = 1 + stats.opened - stats.closed, stats.closed
+        result = "fail" if node is None else "solved"
+        cost = None if node is None else node.cost
+    except JobTimeout:
+        result = "timeout"
+        if isinstance(solver, AnytimeHeuristicSolver) and solver.incumbent is not None:
+            cost = solver.incumbent.cost
+    except MemoryError:
+        result = "memory limit"
+    except RecursionError:
+        result = "recursion stack overflow"
+    except NotImplementedError:
+        result = "not implemented yet"
+    except Exception as e:
+        result = f"error: {e!r}"
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    return JobResult(job.problem, Path(job.instance).stem, solver_name(algorithm_class, heuristic_class),
+                     result, cost, opened, closed, time.perf_counter() - start, _peak_rss())
+
+
+def _raise_timeout(signum, frame):
+    raise JobTimeout()
+
+
+def _limit_memory(megabytes: int) -> None:
+    """ caps the address space at its current size plus the given amount """
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = _address_space() + megabytes * 2**20
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _address_space() -> int:
+    """ current virtual memory size of the process in bytes, 0 if unknown (outside of Linux) """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _peak_rss() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class ResultWriter:
+    """ streams the results to a CSV file (for the .csv suffix) or to JSON lines (otherwise) """
+
+    def __init__(self, output: IO[str], as_csv: bool):
+        self.output = output
+        self.csv = csv.DictWriter(output, fieldnames=[f.name for f in fields(JobResult)]) if as_csv else None
+        if self.csv is not None:
+            self.csv.writeheader()
+
+    def write(self, result: JobResult) -> None:
+        if self.csv is not None:
+            self.csv.writerow(asdict(result))
+        else:
+            self.output.write(json.dumps(asdict(result)) + "\n")
+        self.output.flush()
+
+
+def collect_instances(paths: list[str]) -> list[Path]:
+    """ instance files given directly or found in the given directories """
+    instances: list[Path] = []
+    for path in map(Path, paths):
+        instances += sorted(path.glob("*.txt")) if path.is_dir() else [path]
+    return instances
+
+
+def print_header(problem_class, instances, jobs, workers, timeout, memory_limit, name_width):
+    print(f"> State Search Portfolio Benchmark ({VERSION})")
+    print(f"-   problem: {problem_class.__name__}")
+    print(f"- instances: {len(instances)}")
+    print(f"-      jobs: {jobs} on {workers} workers")
+    print(f"-    limits: {timeout}s, {memory_limit}MB per job")
+    print(f"{'instance': <12} | {'solver name': >{name_width}} | {'closed': <9} | {'time (s)': <8} | {'rss (MB)': <8} | result")
+    print("-" * 120)
+
+
+def print_result(result: JobResult, name_width: int):
+    outcome = str(result.cost) if result.result == "solved" else result.result
+    if result.result != "solved" and result.cost is not None:
+        outcome += f" ({result.cost})"
+    print(f"{result.instance: <12} | {result.solver: >{name_width}} | {result.closed:<9} | "
+          f"{result.time:<8.2f} | {result.peak_rss:<8.1f} | {outcome}", flush=True)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("instances", nargs="+",
+                        help="paths to the problem instances or directories with them")
+    parser.add_argument("-p", "--problem", required=True, choices=avl_problems.keys(),
+                        help="name of the problem type corresponding to the given instances")
+    parser.add_argument("-t", "--timeout", type=float, default=30.0,
+                        help="how long each job (algorithm on an instance) is allowed to work")
+    parser.add_argument("-m", "--memory", type=int, default=2048,
+                        help="how many megabytes of address space each job is allowed to add")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="number of the worker processes")
+    parser.add_argument("-o", "--output",
+                        help="file the results are streamed to, CSV for the .csv suffix, JSON lines otherwise")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    problem_class = avl_problems[args.problem]
+    instances = collect_instances(args.instances)
+    missing = [instance for instance in instances if not instance.is_file()]
+    if missing:
+        print(f"> Path to the instance seems to be incorrect, are you sure of it? ({missing[0]})")
+        exit(-1)
+
+    configurations = list(solver_configurations(args.problem))
+    jobs = [Job(args.problem, str(instance), algorithm_name, heuristic_name, args.timeout, args.memory)
+            for instance in instances
+            for algorithm_name, heuristic_name in configurations]
+    name_width = max(len(solver_name(avl_algos[a], avl_heuristics[h] if h is not None else None))
+                     for a, h in configurations)
+    workers = max(1, min(args.jobs, len(jobs)))
+    print_header(problem_class, instances, len(jobs), workers, args.timeout, args.memory, name_width)
+
+    output = open(args.output, "w", newline="") if args.output else None
+    writer = ResultWriter(output, args.output.endswith(".csv")) if output else None
+    try:
+        # a fresh process per job, so the limits and the peak memory usage are per job
+        with Pool(processes=workers, maxtasksperchild=1) as pool:
+            for result in pool.imap_unordered(run_job, jobs):
+                print_result(result, name_width)
+                if writer is not None:
+                    writer.write(result)
+    finally:
+        if output is not None:
+            output.close()
@@ -1,18 +1,18 @@
 from dataclasses import dataclass
 from problems.blocks_world.blocks_world_state import BlocksWorldState
-from copy import deepcopy
 
-@dataclass
+@dataclass(frozen=True)
 class BlocksWorldAction:
     column_from: int
     column_to: int
 
     def apply(self, state: BlocksWorldState) -> BlocksWorldState:
-        new_columns = [list(col) for col in state.columns]
-        block = new_columns[self.column_from].pop()
-        new_columns[self.column_to].append(block)
+        new_columns = list(state.columns)
+        source = new_columns[self.column_from]
+        new_columns[self.column_from] = source[:-1]
+        new_columns[self.column_to] = new_columns[self.column_to] + source[-1:]
 
-        return BlocksWorldState(new_columns)
+        return BlocksWorldState(new_columns, parent_h=state.h_cache, moved=(self.column_from, self.column_to))
     
     def __str__(self) -> str:
         return f"move block from col: {self.column_from} to col: {self.column_to}"
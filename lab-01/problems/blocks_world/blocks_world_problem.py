@@ -1,27 +1,29 @@
 from __future__ import annotations
-from base.problem import ReversibleProblem
+from base.problem import EncodableProblem, ReversibleProblem
 from problems.blocks_world.blocks_world_action import BlocksWorldAction
 from problems.blocks_world.blocks_world_state import BlocksWorldState
 from PIL import Image, ImageDraw, ImageFont
 
 
-class BlocksWorldProblem(ReversibleProblem[BlocksWorldState, BlocksWorldAction]):
+class BlocksWorldProblem(ReversibleProblem[BlocksWorldState, BlocksWorldAction],
+                         EncodableProblem[BlocksWorldState, BlocksWorldAction]):
+    """
+    A state is encoded column by column, every block as its (1-based) number
+    and every column terminated with 0, so all the encodings have the same length.
+    """
 
     def __init__(self, initial: BlocksWorldState, goal: BlocksWorldState):
         super().__init__(initial, goal)
+        n_columns = len(initial.columns)
+        self.moves = [[BlocksWorldAction(from_idx, to_idx) for to_idx in range(n_columns) if to_idx != from_idx]
+                      for from_idx in range(n_columns)]
+        self.blocks = sorted(block for column in initial.columns for block in column)
+        self.block_numbers = {block: number for number, block in enumerate(self.blocks, start=1)}
 
     def actions(self, state: BlocksWorldState) -> list[BlocksWorldAction]:
-        possible_actions = []
-
-        for from_idx, from_col in enumerate(state.columns):
-            if not from_col:
-                continue
-
-            for to_idx in range(len(state.columns)):
-                if to_idx != from_idx:
-                    possible_actions.append(BlocksWorldAction(from_idx, to_idx))
-
-        return possible_actions
+        return [action
+                for from_idx, from_col in enumerate(state.columns) if from_col
+                for action in self.moves[from_idx]]
 
     def take_action(self, state: BlocksWorldState, action: BlocksWorldAction) -> BlocksWorldState:
         return action.apply(state)
@@ -35,6 +37,20 @@ class BlocksWorldProblem(ReversibleProblem[BlocksWorldState, BlocksWorldAction])
     def reversed(self):
         return BlocksWorldProblem(self.goal, self.initial)
 
+    @property
+    def state_size(self) -> int:
+        assert len(self.blocks) < 256, "the blocks world encoding supports at most 255 blocks"
+        return len(self.blocks) + len(self.initial.columns)
+
+    def encode(self, state: BlocksWorldState) -> bytes:
+        numbers = self.block_numbers
+        return bytes(number for column in state.columns for number in [*(numbers[b] for b in column), 0])
+
+    def decode(self, data: bytes) -> BlocksWorldState:
+        blocks = self.blocks
+        columns = data.split(b'\0')[:-1]
+        return BlocksWorldState(tuple(blocks[number - 1] for number in column) for column in columns)
+
     def to_image(self, state: BlocksWorldState, size: tuple[int, int] = (800, 800)) -> Image.Image:
         state_img = Image.new('RGB', size, color=(248, 255, 229))
         padding_top = 0.1 * state_img.height
@@ -1,10 +1,34 @@
 from __future__ import annotations
+from typing import Any, Iterable
 from base import State
-from dataclasses import dataclass
 
-@dataclass(eq=True)
+
 class BlocksWorldState(State):
-    columns: list[list[str]]
+    """
+    Immutable blocks world state, columns are listed bottom-up.
+
+    Attributes:
+    ===========
+    columns: tuple[tuple[str, ...], ...]
+        blocks of every column, starting from the bottom one
+    parent_h: tuple[Any, float] | None
+        `h_cache` of the state this one has been generated from, used by the incremental heuristics,
+        the state itself isn't referenced, so the ancestors can be freed
+    moved: tuple[int, int] | None
+        (column_from, column_to) of the move that generated this state from the parent
+    h_cache: tuple[Any, float] | None
+        (owner, value) pair memoized by the last heuristic evaluating the state
+    """
+    __slots__ = ('columns', 'hash', 'parent_h', 'moved', 'h_cache')
+
+    def __init__(self, columns: Iterable[Iterable[str]], parent_h: tuple[Any, float] | None = None,
+                 moved: tuple[int, int] | None = None):
+        super().__init__()
+        self.columns = tuple(tuple(col) for col in columns)
+        self.hash = hash(self.columns)
+        self.parent_h = parent_h
+        self.moved = moved
+        self.h_cache: tuple[Any, float] | None = None
 
     def __str__(self) -> str:
         output = "\n"
@@ -19,4 +43,7 @@ class BlocksWorldState(State):
         return output
 
     def __hash__(self) -> int:
-        return tuple((tuple(c) for c in self.columns)).__hash__()
+        return self.hash
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BlocksWorldState) and self.hash == other.hash and self.columns == other.columns
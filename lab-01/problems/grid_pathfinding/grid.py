@@ -3,6 +3,7 @@ from enum import Enum
 
 from base import State
 from typing import Union, cast
+import numpy as np
 from numpy.typing import NDArray
 from dataclasses import dataclass
 
@@ -33,17 +34,20 @@ class GridCoord(State):
 
 @dataclass(frozen=True)
 class Grid:
-    board: NDArray
+    """
+    Grid stored as a compact boolean array indexed by [y, x], `True` marks a wall.
+    """
+    walls: NDArray[np.bool_]
 
     def get_cell(self, c: GridCoord) -> GridCell:
-        return cast(GridCell, self.board[c.y, c.x])
+        return GridCell.WALL if self.walls[c.y, c.x] else GridCell.EMPTY
 
     @property
     def shape(self) -> tuple[int, int]:
-        return cast(tuple[int, int], self.board.shape)
+        return cast(tuple[int, int], self.walls.shape)
     
     def __iter__(self):
-        return iter(self.board)
+        return iter(self.walls)
 
     def __getitem__(self, key):
-        return self.board[key]
\ No newline at end of file
+        return self.walls[key]
\ No newline at end of file
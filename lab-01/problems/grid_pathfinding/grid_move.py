@@ -30,6 +30,16 @@ class GridMove(Enum):
     def diagonal_moves() -> set[GridMove]:
         return {GridMove.NW, GridMove.NE, GridMove.SW, GridMove.SE}
 
+    @staticmethod
+    def from_mask(mask: int) -> Sequence[GridMove]:
+        """ returns moves whose bits are set in the given mask """
+        return _MOVES_BY_MASK[mask]
+
+    @property
+    def bit(self) -> int:
+        """ bit representing the move in the legal moves masks """
+        return _MOVE_BITS[self]
+
     def involved_moves(self) -> Sequence[GridMove]:
         if self not in GridMove.diagonal_moves():
             return [self]
@@ -38,4 +48,8 @@ class GridMove(Enum):
         return [self, GridMove.from_value(shift_l), GridMove.from_value(shift_r)] 
 
     def __str__(self) -> str:
-        return self.name
\ No newline at end of file
+        return self.name
+
+
+_MOVE_BITS: dict[GridMove, int] = {move: 1 << i for i, move in enumerate(GridMove)}
+_MOVES_BY_MASK: list[list[GridMove]] = [[move for move in GridMove if mask & _MOVE_BITS[move]] for mask in range(1 << len(GridMove))]
@@ -1,37 +1,48 @@
 from __future__ import annotations
-from base.problem import ReversibleProblem
+from base.problem import EncodableProblem, ReversibleProblem
 from problems.grid_pathfinding.grid import Grid, GridCell, GridCoord
 from problems.grid_pathfinding.grid_move import GridMove
 import numpy as np
+from numpy.typing import NDArray
 from PIL import Image
 
 from utils.pil_utils import GridDrawer
 
 
-class GridPathfinding(ReversibleProblem[GridCoord, GridMove]):
+class GridPathfinding(ReversibleProblem[GridCoord, GridMove], EncodableProblem[GridCoord, GridMove]):
+    """
+    Legal moves are precomputed once for the whole grid: `legal_moves[y, x]` is a bitmask
+    (see :attr:`GridMove.bit`) of moves available at the given cell, so `actions` is a single table lookup.
+    A cell is encoded as its row-major index.
+    """
+
     def __init__(self, grid: Grid, initial: GridCoord, goal: GridCoord, diagonal_weight: float = 0):
         super().__init__(initial, goal)
         self.grid = grid
         self.diagonal_weight = diagonal_weight
+        self.legal_moves = self._legal_moves_table()
 
     def actions(self, state: GridCoord) -> list[GridMove]:
-        return [a for a in GridMove if self.is_legal_move(state, a)]
+        return list(GridMove.from_mask(self.legal_moves[state.y, state.x]))
 
     def is_legal_move(self, coord: GridCoord, move: GridMove) -> bool:
-        if move in GridMove.diagonal_moves() and self.diagonal_weight <= 0:
-            return False
-
-        for m in move.involved_moves():
-            new_coord = coord + m.value
-            if not (0 <= new_coord.x < self.grid.shape[1]):
-                return False
-            if not (0 <= new_coord.y < self.grid.shape[0]):
-                return False
-
-            new_location = self.grid.get_cell(new_coord)
-            if new_location == GridCell.WALL:
-                return False
-        return True
+        return bool(self.legal_moves[coord.y, coord.x] & move.bit)
+
+    def _legal_moves_table(self) -> NDArray[np.uint8]:
+        """ every move is legal if all its involved moves lead to empty cells inside the grid """
+        height, width = self.grid.shape
+        empty = np.zeros((height + 2, width + 2), dtype=bool)
+        empty[1:-1, 1:-1] = ~self.grid.walls
+        table = np.zeros((height, width), dtype=np.uint8)
+        for move in GridMove:
+            if move in GridMove.diagonal_moves() and self.diagonal_weight <= 0:
+                continue
+            legal = np.ones((height, width), dtype=bool)
+            for m in move.involved_moves():
+                shift_y, shift_x = m.value
+                legal &= empty[1 + shift_y:1 + shift_y + height, 1 + shift_x:1 + shift_x + width]
+            table[legal] |= move.bit
+        return table
 
     def take_action(self, state: GridCoord, action: GridMove) -> GridCoord:
         return state + action.value
@@ -45,15 +56,27 @@ class GridPathfinding(ReversibleProblem[GridCoord, GridMove]):
         return state == self.goal
 
     def reversed(self):
-        return GridPathfinding(self.grid, self.goal, self.initial)
+        return GridPathfinding(self.grid, self.goal, self.initial, self.diagonal_weight)
+
+    @property
+    def state_size(self) -> int:
+        height, width = self.grid.shape
+        return max(1, ((height * width - 1).bit_length() + 7) // 8)
+
+    def encode(self, state: GridCoord) -> bytes:
+        return (state.y * self.grid.shape[1] + state.x).to_bytes(self.state_size, 'big')
+
+    def decode(self, data: bytes) -> GridCoord:
+        y, x = divmod(int.from_bytes(data, 'big'), self.grid.shape[1])
+        return GridCoord(x, y)
 
     def to_image(self, state: GridCoord, size: tuple[int, int] = (800, 800)) -> Image.Image:
         image = Image.new("RGB", size, (248, 255, 229))
         grid_drawer = GridDrawer(image, self.grid)
         grid_drawer.draw_grid()
         for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                if cell == GridCell.WALL:
+            for x, wall in enumerate(row):
+                if wall:
                     grid_drawer.draw_rectangle((x, y), fill=(
                         31, 122, 140), padding=-grid_drawer.border)
         grid_drawer.draw_circle(self.goal.x, self.goal.y, fill=(255, 100, 100))
@@ -70,7 +93,7 @@ class GridPathfinding(ReversibleProblem[GridCoord, GridMove]):
 
         start:GridCoord | None = None
         goal:GridCoord | None = None
-        board = np.full((len(raw_grid), width), GridCell.EMPTY)
+        walls = np.zeros((len(raw_grid), width), dtype=bool)
 
         for y, row in enumerate(raw_grid):
             for x, cell in enumerate(row):
@@ -79,8 +102,8 @@ class GridPathfinding(ReversibleProblem[GridCoord, GridMove]):
                 elif cell.upper() == "G":
                     goal = GridCoord(x, y)
                 elif cell == GridCell.WALL.value:
-                    board[y, x] = GridCell.WALL
+                    walls[y, x] = True
 
         assert start is not None, "grid is missing a start cell 'S'"
         assert goal is not None, "grid is missing a goal cell 'G'"
-        return GridPathfinding(Grid(board), start, goal, diagonal_weight)
+        return GridPathfinding(Grid(walls), start, goal, diagonal_weight)
@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from base import Heuristic
 from problems.grid_pathfinding.grid_pathfinding import GridPathfinding
 from problems.grid_pathfinding.grid import GridCoord
@@ -14,3 +16,12 @@ class GridDiagonalHeuristic(Heuristic[GridCoord]):
         diag_dist = (self.problem.diagonal_weight - 1) * min(abs(state.x - self.problem.goal.x), abs(state.y - self.problem.goal.y))
         
         return  man_dist + diag_dist
+
+    def batch(self, states: Sequence[GridCoord]) -> Sequence[float]:
+        goal_x, goal_y = self.problem.goal.x, self.problem.goal.y
+        diagonal_extra = self.problem.diagonal_weight - 1
+        values = []
+        for state in states:
+            dx, dy = abs(state.x - goal_x), abs(state.y - goal_y)
+            values.append(max(dx, dy) + diagonal_extra * min(dx, dy))
+        return values
@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from base import Heuristic
 from problems.grid_pathfinding.grid_pathfinding import GridPathfinding
 from problems.grid_pathfinding.grid import GridCoord
@@ -11,4 +13,8 @@ class GridEuclideanHeuristic(Heuristic[GridCoord]):
 
     def __call__(self, state: GridCoord) -> float:
         return sqrt((state.x - self.problem.goal.x) ** 2 + (state.y - self.problem.goal.y) ** 2)
+
+    def batch(self, states: Sequence[GridCoord]) -> Sequence[float]:
+        goal_x, goal_y = self.problem.goal.x, self.problem.goal.y
+        return [sqrt((state.x - goal_x) ** 2 + (state.y - goal_y) ** 2) for state in states]
   
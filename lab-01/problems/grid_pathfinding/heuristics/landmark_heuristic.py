@@ -0,0 +1,13 @@
+from base.landmark_heuristic import LandmarkHeuristic, LandmarkTable
+from problems.grid_pathfinding.grid_pathfinding import GridPathfinding
+from problems.grid_pathfinding.grid import GridCoord
+
+
+class GridLandmarkHeuristic(LandmarkHeuristic[GridCoord]):
+    """
+    ALT heuristic for the grids, the landmarks table is built once per map
+    and can be passed to the heuristics of other start/goal pairs on the same map.
+    """
+
+    def __init__(self, problem: GridPathfinding, landmarks: LandmarkTable[GridCoord] | None = None, k: int = 8):
+        super().__init__(problem, landmarks, k)
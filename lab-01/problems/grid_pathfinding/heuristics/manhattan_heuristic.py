@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from base import Heuristic
 from problems.grid_pathfinding.grid_pathfinding import GridPathfinding
 from problems.grid_pathfinding.grid import GridCoord
@@ -11,3 +13,7 @@ class GridManhattanHeuristic(Heuristic[GridCoord]):
     def __call__(self, state: GridCoord) -> float:
         return abs(state.x - self.problem.goal.x) + abs(state.y - self.problem.goal.y)
 
+    def batch(self, states: Sequence[GridCoord]) -> Sequence[float]:
+        goal_x, goal_y = self.problem.goal.x, self.problem.goal.y
+        return [abs(state.x - goal_x) + abs(state.y - goal_y) for state in states]
+
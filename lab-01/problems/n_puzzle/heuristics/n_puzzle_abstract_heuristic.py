@@ -1,14 +1,27 @@
 from abc import ABC
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
 from base import Heuristic
 from problems.n_puzzle import NPuzzleState
 from problems.n_puzzle import NPuzzleProblem
 
 
+"""
+Batches of at least that many states are evaluated with numpy,
+for the smaller ones (e.g. the children of a single node) the numpy calls cost more than the loop.
+"""
+VECTORIZE_FROM = 16
+
+
 class NPuzzleAbstractHeuristic(Heuristic[NPuzzleState], ABC):
 
     def __init__(self, problem: NPuzzleProblem):
         self.problem = problem
         self.goal_coords = self.positions(problem.goal)
+        self.goal_index = {tile: i for i, tile in enumerate(problem.goal.tiles)}
 
     def positions(self, goal: NPuzzleState) -> dict[int,tuple[int,int]]:
         positions: dict[int,tuple[int,int]] = dict()
@@ -17,3 +30,8 @@ class NPuzzleAbstractHeuristic(Heuristic[NPuzzleState], ABC):
                 if cell != 0:
                     positions[cell] = (x,y)
         return positions
+
+    @staticmethod
+    def tiles_matrix(states: Sequence[NPuzzleState]) -> NDArray[np.uint8]:
+        """ the tiles of the states stacked into rows, made of the packed tiles without copying them one by one """
+        return np.frombuffer(b''.join([state.tiles for state in states]), dtype=np.uint8).reshape(len(states), -1)
@@ -1,18 +1,56 @@
-from problems.n_puzzle import NPuzzleState
+from typing import Sequence
 
-from problems.n_puzzle.heuristics.n_puzzle_abstract_heuristic import NPuzzleAbstractHeuristic
+import numpy as np
+
+from problems.n_puzzle import NPuzzleState, NPuzzleProblem
+
+from problems.n_puzzle.heuristics.n_puzzle_abstract_heuristic import NPuzzleAbstractHeuristic, VECTORIZE_FROM
 
 
 class NPuzzleManhattanHeuristic(NPuzzleAbstractHeuristic):
+    """
+    Sum of the manhattan distances of all the tiles to their goal positions.
+
+    `distances[tile][index]` is precalculated for every tile and board index,
+    so a state generated by a single move is evaluated as its parent's value
+    plus the change for the one tile that has moved.
+    A large batch of states is evaluated from scratch, by summing up the `distances` picked with numpy.
+    """
+
+    def __init__(self, problem: NPuzzleProblem):
+        super().__init__(problem)
+        ny = problem.goal.ny
+        size = problem.goal.nx * ny
+        self.distances = [[0] * size for _ in range(size)]
+        for tile, (goal_x, goal_y) in self.goal_coords.items():
+            for index in range(size):
+                current_y, current_x = divmod(index, ny)
+                self.distances[tile][index] = abs(current_x - goal_x) + abs(current_y - goal_y)
+        self.distance_table = np.array(self.distances, dtype=np.float64)
+        self.cells = np.arange(size)
 
     def __call__(self, state: NPuzzleState) -> float:
-        current_positions = self.positions(state)
-        manhattan_distance = 0
+        if state.h_cache is not None and state.h_cache[0] is self:
+            return state.h_cache[1]
+
+        parent_h, moved = state.parent_h, state.moved
+        if parent_h is not None and moved is not None and parent_h[0] is self:
+            # the moved tile now lies where the parent's blank was
+            tile_distances = self.distances[state.tiles[moved]]
+            manhattan_distance = parent_h[1] + tile_distances[moved] - tile_distances[state.blank]
+        else:
+            manhattan_distance = float(sum(self.distances[tile][index]
+                                           for index, tile in enumerate(state.tiles)))
 
-        for tile, (current_x, current_y) in current_positions.items():
-            if tile == 0:  # Skip empty tile
-                continue
-            goal_x, goal_y = self.goal_coords[tile]
-            manhattan_distance += abs(current_x - goal_x) + abs(current_y - goal_y)
+        state.h_cache = (self, manhattan_distance)
+        state.parent_h = None
+        return manhattan_distance
 
-        return float(manhattan_distance)
+    def batch(self, states: Sequence[NPuzzleState]) -> Sequence[float]:
+        if len(states) < VECTORIZE_FROM:
+            return super().batch(states)
+        values = self.distance_table[self.tiles_matrix(states), self.cells].sum(axis=1).tolist()
+        for state, value in zip(states, values):
+            state.h_cache = (self, value)
+            state.parent_h = None
+        return values
@@ -1,17 +1,30 @@
-from problems.n_puzzle import NPuzzleState
-from problems.n_puzzle.heuristics.n_puzzle_abstract_heuristic import NPuzzleAbstractHeuristic
+from typing import Sequence
+
+import numpy as np
+
+from problems.n_puzzle import NPuzzleState, NPuzzleProblem
+from problems.n_puzzle.heuristics.n_puzzle_abstract_heuristic import NPuzzleAbstractHeuristic, VECTORIZE_FROM
 
 
 class NPuzzleTilesOutOfPlaceHeuristic(NPuzzleAbstractHeuristic):
 
+    def __init__(self, problem: NPuzzleProblem):
+        super().__init__(problem)
+        self.goal_tiles = np.frombuffer(problem.goal.tiles, dtype=np.uint8)
+
     def __call__(self, state: NPuzzleState) -> float:
-        current_positions = self.positions(state)
+        goal_tiles = self.problem.goal.tiles
         tiles_out_of_place = 0
 
-        for tile, position in current_positions.items():
-            if tile == 0:
-                continue
-            if position != self.goal_coords[tile]:
+        for tile, goal_tile in zip(state.tiles, goal_tiles):
+            if tile != 0 and tile != goal_tile:
                 tiles_out_of_place += 1
 
         return float(tiles_out_of_place)
+
+    def batch(self, states: Sequence[NPuzzleState]) -> Sequence[float]:
+        if len(states) < VECTORIZE_FROM:
+            return super().batch(states)
+        tiles = self.tiles_matrix(states)
+        out_of_place = (tiles != self.goal_tiles) & (tiles != 0)
+        return out_of_place.sum(axis=1, dtype=np.float64).tolist()
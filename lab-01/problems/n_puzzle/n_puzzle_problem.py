@@ -2,47 +2,61 @@ from __future__ import annotations
 from pathlib import Path
 
 from PIL import Image
-from base.problem import ReversibleProblem
+from base.problem import EncodableProblem, ReversibleProblem
 from problems.n_puzzle import NPuzzleState
-from copy import deepcopy
 
 from problems.n_puzzle.n_puzzle_action import NPuzzleAction
 
 
-class NPuzzleProblem(ReversibleProblem[NPuzzleState, NPuzzleAction]):
+class NPuzzleProblem(ReversibleProblem[NPuzzleState, NPuzzleAction], EncodableProblem[NPuzzleState, NPuzzleAction]):
 
     def __init__(self, initial: NPuzzleState, goal: NPuzzleState):
         super().__init__(initial, goal)
+        self.moves = self._precalculate_moves(initial.nx, initial.ny)
+
+    def _precalculate_moves(self, nx: int, ny: int) -> list[dict[NPuzzleAction, int]]:
+        """ for every blank index returns legal actions mapped to the new blank index """
+        moves: list[dict[NPuzzleAction, int]] = []
+        for blank in range(nx * ny):
+            x, y = divmod(blank, ny)
+            moves.append({shift: (x + shift.value[0]) * ny + y + shift.value[1]
+                          for shift in NPuzzleAction
+                          if self.valid(x + shift.value[0], y + shift.value[1], nx, ny)})
+        return moves
 
     def actions(self, state: NPuzzleState) -> list[NPuzzleAction]:
-        return [shift for shift in NPuzzleAction
-                if self.valid(state.x + shift.value[0],
-                              state.y + shift.value[1],
-                              state.nx, state.ny)]
+        return list(self.moves[state.blank])
 
     def take_action(self, state: NPuzzleState, action: NPuzzleAction) -> NPuzzleState:
-        shift_x, shift_y = action.value
-        if self.valid(state.x+shift_x, state.y+shift_y, state.nx, state.ny):
-            state2 = deepcopy(state)
-            state2.matrix[state2.x][state2.y] = state2.matrix[state2.x +
-                                                              shift_x][state2.y+shift_y]
-            state2.matrix[state2.x+shift_x][state2.y +
-                                            shift_y] = state.matrix[state.x][state.y]
-            state2.x = state2.x + shift_x
-            state2.y = state2.y + shift_y
-            return state2
-
-        raise Exception("Illegal action")
+        new_blank = self.moves[state.blank].get(action)
+        if new_blank is None:
+            raise Exception("Illegal action")
+
+        tiles = bytearray(state.tiles)
+        tiles[state.blank] = tiles[new_blank]
+        tiles[new_blank] = 0
+        return NPuzzleState(bytes(tiles), new_blank, state.nx, state.ny,
+                            parent_h=state.h_cache, moved=state.blank)
 
     def action_cost(self, state: NPuzzleState, action: NPuzzleAction) -> float:
         return 1
 
     def is_goal(self, state: NPuzzleState) -> bool:
-        return self.goal.matrix == state.matrix
+        return self.goal.tiles == state.tiles
 
     def reversed(self):
         return NPuzzleProblem(self.goal, self.initial)
 
+    @property
+    def state_size(self) -> int:
+        return len(self.initial.tiles)
+
+    def encode(self, state: NPuzzleState) -> bytes:
+        return state.tiles
+
+    def decode(self, data: bytes) -> NPuzzleState:
+        return NPuzzleState(data, data.index(0), self.initial.nx, self.initial.ny)
+
     def valid(self, x: int, y: int, nx: int, ny: int) -> bool:
         return 0 <= x < nx and 0 <= y < ny
 
@@ -81,18 +95,10 @@ class NPuzzleProblem(ReversibleProblem[NPuzzleState, NPuzzleAction]):
         def read_line(l: str) -> list[int]:
             return [int(v) for v in l.split()]
 
-        def zero_coords(array: list[list[int]]) -> tuple[int, int]:
-            for i, row in enumerate(array):
-                if 0 in row:
-                    return i, row.index(0)
-            assert False, "the n-puzzle state should contain 0"
-
         lines = text.splitlines()
         initial: list[list[int]] = []
         initial.append(read_line(lines[0]))
         size = len(initial[0])
-        ix = 0 if 0 in initial[0] else -1
-        iy = -1 if ix < 0 else initial[0].index(0)
 
         for i in range(1, size):
             initial.append(read_line(lines[i]))
@@ -112,6 +118,6 @@ class NPuzzleProblem(ReversibleProblem[NPuzzleState, NPuzzleAction]):
         assert init_numbers == goal_numbers, \
             "the n-puzzle init and goal states should share the same numbers"
 
-        ix, iy = zero_coords(initial)
-        gx, gy = zero_coords(goal)
-        return NPuzzleProblem(NPuzzleState(initial, ix, iy), NPuzzleState(goal, gx, gy))
+        assert 0 in init_numbers, "the n-puzzle state should contain 0"
+
+        return NPuzzleProblem(NPuzzleState.from_matrix(initial), NPuzzleState.from_matrix(goal))
@@ -1,27 +1,70 @@
+from __future__ import annotations
+from typing import Any
 from base import State
 
 
 class NPuzzleState(State):
-    def __init__(self, matrix: list[list[int]], x: int, y: int):
+    """
+    Packed representation of the n-puzzle board.
+
+    Attributes:
+    ===========
+    tiles: bytes
+        the board flattened row by row, 0 stands for the blank
+    blank: int
+        index of the blank in `tiles`, cached so moves don't have to look for it
+    nx: int
+        number of rows
+    ny: int
+        number of columns
+    parent_h: tuple[Any, float] | None
+        `h_cache` of the state this one has been generated from, used by the incremental heuristics,
+        the state itself isn't referenced, so the ancestors can be freed
+    moved: int | None
+        index the moved tile now lies at, the blank of the state this one has been generated from
+    h_cache: tuple[Any, float] | None
+        (owner, value) pair memoized by the last heuristic evaluating the state
+    """
+    __slots__ = ('tiles', 'blank', 'nx', 'ny', 'parent_h', 'moved', 'h_cache')
+
+    def __init__(self, tiles: bytes, blank: int, nx: int, ny: int,
+                 parent_h: tuple[Any, float] | None = None, moved: int | None = None):
         super().__init__()
-        self.matrix = matrix
-        self.x = x
-        self.y = y
-        self.nx = len(self.matrix)
-        self.ny = len(self.matrix[0])
+        self.tiles = tiles
+        self.blank = blank
+        self.nx = nx
+        self.ny = ny
+        self.parent_h = parent_h
+        self.moved = moved
+        self.h_cache: tuple[Any, float] | None = None
+
+    @staticmethod
+    def from_matrix(matrix: list[list[int]]) -> NPuzzleState:
+        tiles = bytes(cell for row in matrix for cell in row)
+        return NPuzzleState(tiles, tiles.index(0), len(matrix), len(matrix[0]))
+
+    @property
+    def x(self) -> int:
+        """ row of the blank """
+        return self.blank // self.ny
+
+    @property
+    def y(self) -> int:
+        """ column of the blank """
+        return self.blank % self.ny
+
+    @property
+    def matrix(self) -> list[list[int]]:
+        return [list(self.tiles[r * self.ny:(r + 1) * self.ny]) for r in range(self.nx)]
 
     def __hash__(self):
-        return hash(tuple([tuple(l) for l in self.matrix]))
+        return hash(self.tiles)
 
     def __str__(self) -> str:
         s = "\n"
-        for i in range(self.nx):
-            for j in range(self.ny):
-                if j == self.ny - 1:
-                    s += ''.join(f"{self.matrix[i][j]}\n")
-                else:
-                    s += ''.join(f"{self.matrix[i][j]} ")
+        for row in self.matrix:
+            s += " ".join(str(cell) for cell in row) + "\n"
         return s
 
     def __eq__(self, other):
-        return self.matrix == other.matrix
+        return self.tiles == other.tiles
@@ -4,8 +4,30 @@ from problems.pancake.pancake_state import PancakeState
 
 
 class PancakeGapHeuristic(Heuristic):
+    """
+    Number of adjacent pancakes (the plate included) that don't differ in size by one.
+
+    A flip reverses the top of the stack, so it changes only the pair at the flip boundary:
+    a state generated by a flip is evaluated as its parent's value plus the change at that pair.
+    """
+
     def __init__(self, problem: PancakeProblem):
         self.problem = problem
 
     def __call__(self, state: PancakeState) -> float:
-        return sum([1 for i in range(self.problem.n_pancakes) if abs(state.pancakes[i + 1] - state.pancakes[i]) != 1])
+        if state.h_cache is not None and state.h_cache[0] is self:
+            return state.h_cache[1]
+
+        pancakes = state.pancakes
+        parent_h = state.parent_h
+        if parent_h is not None and parent_h[0] is self:
+            # the flip has swapped the pancakes at the top and at the boundary, the one below stays
+            depth = state.flip_depth
+            below = pancakes[depth]
+            gaps = parent_h[1] - (abs(below - pancakes[0]) != 1) + (abs(below - pancakes[depth - 1]) != 1)
+        else:
+            gaps = float(sum([1 for i in range(self.problem.n_pancakes) if abs(pancakes[i + 1] - pancakes[i]) != 1]))
+
+        state.h_cache = (self, gaps)
+        state.parent_h = None
+        return gaps
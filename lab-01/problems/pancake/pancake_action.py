@@ -1,16 +1,12 @@
-from dataclasses import dataclass, astuple
+from dataclasses import dataclass
 from problems.pancake.pancake_state import PancakeState
-from copy import deepcopy
 
 
-@dataclass
+@dataclass(frozen=True)
 class PancakeAction:
     flip_depth: int
 
     def apply(self, state: PancakeState) -> PancakeState:
-        new_pancakes = deepcopy(state.pancakes)
-        new_pancakes[0:self.flip_depth] = new_pancakes[0:self.flip_depth][::-1]
-        return PancakeState(new_pancakes)
-
-    def __hash__(self):
-        return hash(astuple(self))
+        pancakes = state.pancakes
+        depth = self.flip_depth
+        return PancakeState(pancakes[depth - 1::-1] + pancakes[depth:], parent_h=state.h_cache, flip_depth=depth)
@@ -1,19 +1,20 @@
 from __future__ import annotations
-from base.problem import Problem
+from base.problem import EncodableProblem
 from problems.pancake.pancake_state import PancakeState
 from problems.pancake.pancake_action import PancakeAction
 from PIL import Image, ImageDraw
 
 
-class PancakeProblem(Problem[PancakeState, PancakeAction]):
+class PancakeProblem(EncodableProblem[PancakeState, PancakeAction]):
     def __init__(self, initial: PancakeState):
         super().__init__(initial)
         # last number in a list of pancakes is always the biggest and it represents the plate
         self.n_pancakes = len(initial.pancakes) - 1
         self.goal = PancakeState(pancakes=[i for i in range(1, self.n_pancakes + 2)])
+        self.flips = tuple(PancakeAction(flip_depth=depth) for depth in range(2, self.n_pancakes + 1))
 
     def actions(self, state: PancakeState) -> list[PancakeAction]:
-        return [PancakeAction(flip_depth=depth) for depth in range(2, self.n_pancakes + 1)]
+        return list(self.flips)
 
     def take_action(self, state: PancakeState, action: PancakeAction) -> PancakeState:
         return action.apply(state)
@@ -24,6 +25,16 @@ class PancakeProblem(Problem[PancakeState, PancakeAction]):
     def is_goal(self, state: PancakeState) -> bool:
         return state == self.goal
 
+    @property
+    def state_size(self) -> int:
+        return self.n_pancakes + 1
+
+    def encode(self, state: PancakeState) -> bytes:
+        return state.pancakes
+
+    def decode(self, data: bytes) -> PancakeState:
+        return PancakeState(data)
+
     def to_image(self, state: PancakeState, size: tuple[int, int] = (800, 800)) -> Image.Image:
         background_color = (248, 255, 229)
         pancake_color = (236, 162, 77)
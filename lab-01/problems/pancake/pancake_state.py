@@ -1,13 +1,38 @@
+from __future__ import annotations
+from typing import Any, Iterable
 from base import State
-from dataclasses import dataclass
 
 
-@dataclass
 class PancakeState(State):
-    pancakes: list[int]
+    """
+    Immutable stack of pancakes, the top one first, the plate (the biggest number) last.
+
+    Attributes:
+    ===========
+    pancakes: bytes
+        sizes of the pancakes, bytes hash their content only once
+    parent_h: tuple[Any, float] | None
+        `h_cache` of the state this one has been generated from, used by the incremental heuristics,
+        the state itself isn't referenced, so the ancestors can be freed
+    flip_depth: int
+        number of pancakes flipped to get this state from the parent
+    h_cache: tuple[Any, float] | None
+        (owner, value) pair memoized by the last heuristic evaluating the state
+    """
+    __slots__ = ('pancakes', 'parent_h', 'flip_depth', 'h_cache')
+
+    def __init__(self, pancakes: bytes | Iterable[int], parent_h: tuple[Any, float] | None = None, flip_depth: int = 0):
+        super().__init__()
+        self.pancakes = bytes(pancakes)
+        self.parent_h = parent_h
+        self.flip_depth = flip_depth
+        self.h_cache: tuple[Any, float] | None = None
 
     def __hash__(self) -> int:
-        return hash(tuple(self.pancakes))
+        return hash(self.pancakes)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PancakeState) and self.pancakes == other.pancakes
 
     def __str__(self) -> str:
         return " ".join([str(pancake) for pancake in self.pancakes])
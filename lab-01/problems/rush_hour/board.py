@@ -1,13 +1,134 @@
+from __future__ import annotations
+from typing import Iterable
+
 import numpy as np
 
-from problems.rush_hour.vehicle import RushHourVehicle
+from problems.rush_hour.vehicle import Orientation, RushHourVehicle
 from base import State
 
 
-class RushHourBoard(State):
-    def __init__(self, vehicles: set[RushHourVehicle], shape: tuple[int, int] = (6, 6)):
-        self.vehicles = vehicles
+class RushHourLayout:
+    """
+    The part of the puzzle that never changes, shared by all its boards.
+
+    Vehicles are kept in a fixed order and every vehicle moves along its lane,
+    so its position is a single integer: x of its first cell if it's horizontal, y otherwise.
+    All the positions are packed into one integer `key`, `bits` bits per vehicle.
+    Cells are numbered row by row: cell (x, y) is the bit `y * width + x` of the occupancy bitboard.
+
+    Attributes:
+    ===========
+    shape: tuple[int, int]
+        (height, width) of the board
+    ids: tuple[str, ...]
+        vehicle ids in the fixed order
+    orientations: tuple[Orientation, ...]
+    lengths: tuple[int, ...]
+    lanes: tuple[int, ...]
+        the fixed coordinate of every vehicle: y if it's horizontal, x otherwise
+    index: dict[str, int]
+        position of the vehicle id in the fixed order
+    bits: int
+        number of bits used by a single position in the packed key
+    cells: list[list[int]]
+        `cells[i][p]` is the bitboard of the cells covered by the i-th vehicle at position p
+    behind: list[list[int]]
+        `behind[i][p]` is the bit of the cell the i-th vehicle enters moving up/left, 0 at the edge
+    ahead: list[list[int]]
+        `ahead[i][p]` is the bit of the cell the i-th vehicle enters moving down/right, 0 at the edge
+    """
+
+    def __init__(self, vehicles: Iterable[RushHourVehicle], shape: tuple[int, int]):
+        vehicles = sorted(vehicles, key=lambda v: v.id)
+        height, width = shape
         self.shape = shape
+        self.ids = tuple(v.id for v in vehicles)
+        self.orientations = tuple(v.orientation for v in vehicles)
+        self.lengths = tuple(v.length for v in vehicles)
+        self.lanes = tuple(v.y if v.orientation == Orientation.HORIZONTAL else v.x for v in vehicles)
+        self.index = {id: i for i, id in enumerate(self.ids)}
+        self.bits = max(height, width).bit_length()
+
+        self.cells: list[list[int]] = []
+        self.behind: list[list[int]] = []
+        self.ahead: list[list[int]] = []
+        for orientation, length, lane in zip(self.orientations, self.lengths, self.lanes):
+            if orientation == Orientation.HORIZONTAL:
+                lane_cells = [1 << (lane * width + x) for x in range(width)]
+            else:
+                lane_cells = [1 << (y * width + lane) for y in range(height)]
+            positions = range(len(lane_cells) - length + 1)
+            self.cells.append([sum(lane_cells[p:p + length]) for p in positions])
+            self.behind.append([lane_cells[p - 1] if p > 0 else 0 for p in positions])
+            self.ahead.append([lane_cells[p + length] if p + length < len(lane_cells) else 0 for p in positions])
+
+    def pack(self, vehicles: Iterable[RushHourVehicle]) -> int:
+        """ returns the packed key of the given vehicles positions """
+        key = 0
+        for v in vehicles:
+            i = self.index[v.id]
+            position = v.x if self.orientations[i] == Orientation.HORIZONTAL else v.y
+            key |= position << (i * self.bits)
+        return key
+
+    def occupancy(self, key: int) -> int:
+        """ returns the bitboard of the cells occupied by the vehicles """
+        mask = (1 << self.bits) - 1
+        return sum(self.cells[i][(key >> (i * self.bits)) & mask] for i in range(len(self.ids)))
+
+
+class RushHourBoard(State):
+    """
+    Compact representation of the Rush Hour board.
+
+    Hashing and equality use only the packed positions of the vehicles,
+    so boards of different puzzles should never be compared.
+
+    Attributes:
+    ===========
+    layout: RushHourLayout
+        the fixed part of the puzzle
+    key: int
+        packed positions of all the vehicles (see :class:`RushHourLayout`)
+    occupied: int
+        bitboard of the occupied cells
+    """
+    __slots__ = ('layout', 'key', 'occupied')
+
+    def __init__(self, layout: RushHourLayout, key: int, occupied: int | None = None):
+        super().__init__()
+        self.layout = layout
+        self.key = key
+        self.occupied = occupied if occupied is not None else layout.occupancy(key)
+
+    @staticmethod
+    def from_vehicles(vehicles: Iterable[RushHourVehicle], shape: tuple[int, int] = (6, 6)) -> RushHourBoard:
+        vehicles = list(vehicles)
+        layout = RushHourLayout(vehicles, shape)
+        return RushHourBoard(layout, layout.pack(vehicles))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.layout.shape
+
+    def position(self, i: int) -> int:
+        """ returns position of the i-th vehicle along its lane """
+        bits = self.layout.bits
+        return (self.key >> (i * bits)) & ((1 << bits) - 1)
+
+    @property
+    def vehicles(self) -> list[RushHourVehicle]:
+        """ builds the vehicles on every access, the hot paths (moves, heuristics) should read `position(i)` instead """
+        layout = self.layout
+        vehicles = []
+        for i, (id, orientation, length, lane) in enumerate(
+                zip(layout.ids, layout.orientations, layout.lengths, layout.lanes)):
+            position = self.position(i)
+            if orientation == Orientation.HORIZONTAL:
+                vehicles.append(RushHourVehicle(id, position, lane, orientation, length))
+            else:
+                vehicles.append(RushHourVehicle(id, lane, position, orientation, length))
+        return vehicles
 
     def get_board(self):
         board = np.full(self.shape, ' ')
@@ -18,7 +139,7 @@ class RushHourBoard(State):
         return board
 
     def __hash__(self):
-        return hash(self.__str__())
+        return hash(self.key)
 
     def __str__(self) -> str:
         s = '\n'
@@ -27,4 +148,4 @@ class RushHourBoard(State):
         return s
 
     def __eq__(self, other):
-        return (self.get_board() == other.get_board()).all()
+        return isinstance(other, RushHourBoard) and self.key == other.key
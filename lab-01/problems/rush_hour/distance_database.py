@@ -0,0 +1,115 @@
+from __future__ import annotations
+from hashlib import sha1
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from problems.rush_hour.board import RushHourBoard
+from problems.rush_hour.rush_hour import RushHourProblem
+
+
+DATABASES_DIR = Path(__file__).parent.joinpath("databases")
+UNREACHED = 255
+
+
+def database_name(problem: RushHourProblem) -> str:
+    """ name identifying the puzzle layout and its goal, shared by all the boards of the layout """
+    layout = problem.initial.layout
+    height, width = layout.shape
+    description = repr((layout.ids, [o.value for o in layout.orientations], layout.lengths, layout.lanes,
+                        problem.goal_index, problem.goal_key))
+    return f"{height}x{width}_{sha1(description.encode()).hexdigest()[:16]}"
+
+
+class RushHourDistanceDatabase:
+    """
+    Exact number of moves to the goal for every board of the enumerated puzzle configurations.
+
+    Tables are keyed by the packed vehicle positions (see :class:`RushHourLayout`),
+    kept sorted so a lookup is a binary search. A board that can't reach the goal
+    has the `UNREACHED` distance. One file per layout and goal holds all its configurations
+    enumerated so far; a query from an unknown configuration enumerates it and extends the file.
+
+    Attributes:
+    ===========
+    keys: NDArray[np.uint64]
+        sorted packed positions of the known boards
+    distances: NDArray[np.uint8]
+        `distances[i]` is the distance to the goal of the board `keys[i]`
+    """
+
+    def __init__(self, keys: NDArray[np.uint64], distances: NDArray[np.uint8]):
+        self.keys = keys
+        self.distances = distances
+
+    @staticmethod
+    def load_or_build(problem: RushHourProblem, directory: Path = DATABASES_DIR) -> RushHourDistanceDatabase:
+        """ loads the table stored on disk, enumerates the problem configurations first if they are missing """
+        layout = problem.initial.layout
+        assert layout.bits * len(layout.ids) <= 64, "packed positions don't fit into 64 bits"
+        path = directory.joinpath(f"{database_name(problem)}.npz")
+        if path.exists():
+            with np.load(path) as stored:
+                database = RushHourDistanceDatabase(stored["keys"], stored["distances"])
+            if database.distance(problem.initial) is not None:
+                return database
+        else:
+            database = RushHourDistanceDatabase(np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint8))
+
+        keys, distances = RushHourDistanceDatabase.build(problem)
+        keys = np.concatenate((database.keys, keys))
+        distances = np.concatenate((database.distances, distances))
+        order = np.argsort(keys)
+        database = RushHourDistanceDatabase(keys[order], distances[order])
+
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, keys=database.keys, distances=database.distances)
+        tmp_path.replace(path)
+        return database
+
+    @staticmethod
+    def build(problem: RushHourProblem) -> tuple[NDArray[np.uint64], NDArray[np.uint8]]:
+        """
+        Enumerates the boards reachable from the initial one, then runs a retrograde
+        breadth-first search starting from all the goal boards at once.
+        Every shift can be undone, so the forward moves serve as the backward ones.
+        """
+        boards = {problem.initial.key: problem.initial}
+        queue = [problem.initial]
+        for board in queue:
+            for action in problem.actions(board):
+                child = problem.take_action(board, action)
+                if child.key not in boards:
+                    boards[child.key] = child
+                    queue.append(child)
+
+        layer = [board for board in boards.values() if problem.is_goal(board)]
+        distances = {board.key: 0 for board in layer}
+        depth = 0
+        while layer:
+            depth += 1
+            assert depth < UNREACHED, "distances don't fit into the table"
+            next_layer = []
+            for board in layer:
+                for action in problem.actions(board):
+                    child = problem.take_action(board, action)
+                    if child.key not in distances:
+                        distances[child.key] = depth
+                        next_layer.append(child)
+            layer = next_layer
+
+        keys = np.fromiter(boards.keys(), dtype=np.uint64, count=len(boards))
+        table = np.fromiter((distances.get(key, UNREACHED) for key in boards), dtype=np.uint8, count=len(boards))
+        return keys, table
+
+    def distance(self, board: RushHourBoard) -> int | None:
+        """ returns the number of moves to the goal, `UNREACHED` if there's no way, None for an unknown board """
+        i = int(np.searchsorted(self.keys, board.key))
+        if i < len(self.keys) and self.keys[i] == board.key:
+            return int(self.distances[i])
+        return None
+
+    def __len__(self) -> int:
+        return len(self.keys)
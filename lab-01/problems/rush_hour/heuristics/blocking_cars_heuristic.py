@@ -8,14 +8,24 @@ from base import Heuristic
 class RushHourBlockingCarsHeuristic(Heuristic[RushHourBoard]):
     def __init__(self, problem: RushHourProblem) -> None:
         super().__init__(problem)
+        layout = problem.initial.layout
+        self.target = layout.index['X']
+        self.vertical = [i for i, orientation in enumerate(layout.orientations)
+                         if orientation == Orientation.VERTICAL]
 
     def __call__(self, board: RushHourBoard) -> float:
-        target_vehicle = [vehicle for vehicle in board.vehicles if vehicle.id == 'X'][0]
-        if target_vehicle.x == 4:
+        layout = board.layout
+        lengths, lanes = layout.lengths, layout.lanes
+        target_x = board.position(self.target)
+        if target_x == 4:
             return 0
+        target_end = target_x + lengths[self.target] - 1
+        target_y = lanes[self.target]
         blockingcars = 0
-        for vehicle in board.vehicles:
-            if vehicle.orientation == Orientation.VERTICAL and vehicle.x > target_vehicle.xEnd and vehicle.y <= target_vehicle.y and vehicle.yEnd >= target_vehicle.y:
-                blockingcars += 1
-        distance = board.shape[1] - (target_vehicle.xEnd)
+        for i in self.vertical:
+            if lanes[i] > target_end:
+                y = board.position(i)
+                if y <= target_y <= y + lengths[i] - 1:
+                    blockingcars += 1
+        distance = board.shape[1] - target_end
         return blockingcars + distance
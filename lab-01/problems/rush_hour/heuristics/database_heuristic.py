@@ -0,0 +1,21 @@
+from problems.rush_hour.board import RushHourBoard
+from problems.rush_hour.distance_database import UNREACHED, RushHourDistanceDatabase
+from problems.rush_hour.rush_hour import RushHourProblem
+
+from base import Heuristic
+
+
+class RushHourDatabaseHeuristic(Heuristic[RushHourBoard]):
+    """
+    Perfect heuristic: exact distance to the goal read from the retrograde distance database.
+    The database is built once per puzzle layout and stored on disk (see :class:`RushHourDistanceDatabase`).
+    """
+
+    def __init__(self, problem: RushHourProblem) -> None:
+        self.database = RushHourDistanceDatabase.load_or_build(problem)
+
+    def __call__(self, board: RushHourBoard) -> float:
+        distance = self.database.distance(board)
+        if distance is None or distance == UNREACHED:
+            return float('inf')
+        return distance
@@ -6,8 +6,9 @@ from problems.rush_hour.rush_hour import RushHourProblem
 class RushHourDistanceToExitHeuristic(Heuristic[RushHourBoard]):
     def __init__(self, problem: RushHourProblem) -> None:
         super().__init__(problem)
+        self.target = problem.initial.layout.index['X']
 
     def __call__(self, board: RushHourBoard) -> float:
-        target_vehicle = [vehicle for vehicle in board.vehicles if vehicle.id == 'X'][0]
-        distance = board.shape[1] - (target_vehicle.xEnd)
+        target_end = board.position(self.target) + board.layout.lengths[self.target] - 1
+        distance = board.shape[1] - target_end
         return distance
@@ -1,6 +1,6 @@
 from problems.rush_hour.board import RushHourBoard
 from problems.rush_hour.rush_hour import RushHourProblem
-from problems.rush_hour.vehicle import Orientation, RushHourVehicle
+from problems.rush_hour.vehicle import Orientation
 
 from base import Heuristic
 
@@ -8,35 +8,54 @@ from base import Heuristic
 class RushHourIndirectHeuristic(Heuristic[RushHourBoard]):
     def __init__(self, problem: RushHourProblem) -> None:
         super().__init__(problem)
+        layout = problem.initial.layout
+        self.target = layout.index['X']
+        self.vertical = [orientation == Orientation.VERTICAL for orientation in layout.orientations]
 
     def __call__(self, board: RushHourBoard) -> float:
-        def optimistic_unblock(v: RushHourVehicle, ty: int) -> int:  
+        layout = board.layout
+        lengths, lanes, vertical = layout.lengths, layout.lanes, self.vertical
+        height = board.shape[0]
+        positions = [board.position(i) for i in range(len(lengths))]
+
+        def optimistic_unblock(i: int, ty: int) -> int:
+            x, y = lanes[i], positions[i]
+            y_end = y + lengths[i] - 1
             top_border = 0
-            bot_border = board.shape[0]
-            top_blocking_vhs = [v2 for v2 in board.vehicles if
-                                v2.y < v.y 
-                                and v2.x <= v.x 
-                                and v2.xEnd >= v.x]
-            bot_blocking_vhs = [v2 for v2 in board.vehicles if
-                                v2.y > v.yEnd 
-                                and v2.x <= v.x 
-                                and v2.xEnd >= v.x]
-            top_border += sum((v2.length for v2 in top_blocking_vhs if v2.orientation == Orientation.VERTICAL))
-            bot_border -= sum((v2.length for v2 in bot_blocking_vhs if v2.orientation == Orientation.VERTICAL))
-            to_top = v.yEnd - ty - 1 if v.length + top_border < ty else board.shape[0]
-            to_bot = ty - v.y + 1 if bot_border - v.length > ty else board.shape[0]
-            to_top += len(top_blocking_vhs)
-            to_bot += len(bot_blocking_vhs)
+            bot_border = height
+            top_blocking_vhs = bot_blocking_vhs = 0
+            for j, length in enumerate(lengths):
+                if vertical[j]:
+                    x2 = x2_end = lanes[j]
+                    y2 = positions[j]
+                else:
+                    x2 = positions[j]
+                    x2_end = x2 + length - 1
+                    y2 = lanes[j]
+                if not x2 <= x <= x2_end:
+                    continue
+                if y2 < y:
+                    top_blocking_vhs += 1
+                    top_border += length if vertical[j] else 0
+                elif y2 > y_end:
+                    bot_blocking_vhs += 1
+                    bot_border -= length if vertical[j] else 0
+            to_top = y_end - ty - 1 if lengths[i] + top_border < ty else height
+            to_bot = ty - y + 1 if bot_border - lengths[i] > ty else height
+            to_top += top_blocking_vhs
+            to_bot += bot_blocking_vhs
             return min(to_top, to_bot)
 
-        target_vehicle = [v for v in board.vehicles if v.id == 'X'][0]
-        if target_vehicle.x == 4:
+        target_x = positions[self.target]
+        if target_x == 4:
             return 0
-        blocking_vehicles = [v for v in board.vehicles 
-                             if v.orientation == Orientation.VERTICAL 
-                                and v.x > target_vehicle.xEnd 
-                                and v.y <= target_vehicle.y 
-                                and v.yEnd >= target_vehicle.y]
-        moves_to_unblock = sum([optimistic_unblock(v, target_vehicle.y) for v in blocking_vehicles])
-        distance = board.shape[1] - (target_vehicle.xEnd)
+        target_end = target_x + lengths[self.target] - 1
+        target_y = lanes[self.target]
+        blocking_vehicles = [i for i, y in enumerate(positions)
+                             if vertical[i]
+                                and lanes[i] > target_end
+                                and y <= target_y
+                                and y + lengths[i] - 1 >= target_y]
+        moves_to_unblock = sum([optimistic_unblock(i, target_y) for i in blocking_vehicles])
+        distance = board.shape[1] - target_end
         return moves_to_unblock + distance
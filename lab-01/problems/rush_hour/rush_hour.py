@@ -1,5 +1,5 @@
 from __future__ import annotations
-from base import Problem
+from base.problem import EncodableProblem
 from problems.rush_hour.vehicle import RushHourVehicle, Orientation
 from problems.rush_hour.board import RushHourBoard
 from problems.rush_hour.rush_hour_action import Direction, VehicleShift
@@ -12,56 +12,71 @@ from PIL import Image, ImageDraw
 from utils.pil_utils import GridDrawer
 
 
-class RushHourProblem(Problem[RushHourBoard, VehicleShift]):
+class RushHourProblem(EncodableProblem[RushHourBoard, VehicleShift]):
+    """
+    Moves are generated from the occupancy bitboard: a vehicle can shift if the single cell
+    it enters is on the board and empty. The shifts of every vehicle are created once.
+    A board is encoded as its packed key (see :class:`RushHourLayout`).
+    """
+
     def __init__(self, vehicles: set[RushHourVehicle], initial: RushHourBoard, goal_vehicle_position: RushHourVehicle = RushHourVehicle('X', 4, 2, Orientation.HORIZONTAL)):
         super().__init__(initial)
         self.goal = goal_vehicle_position
         self.vehicles = vehicles
+        layout = initial.layout
+        self.goal_index = layout.index[self.goal.id]
+        self.goal_key = self.goal.x if self.goal.orientation == Orientation.HORIZONTAL else self.goal.y
+
+        backward = {Orientation.VERTICAL: Direction.UP, Orientation.HORIZONTAL: Direction.LEFT}
+        forward = {Orientation.VERTICAL: Direction.DOWN, Orientation.HORIZONTAL: Direction.RIGHT}
+        self.shifts = [(VehicleShift(backward[orientation], id), VehicleShift(forward[orientation], id))
+                       for id, orientation in zip(layout.ids, layout.orientations)]
+        self.steps: dict[VehicleShift, tuple[int, int]] = {}
+        for i, (back, fwd) in enumerate(self.shifts):
+            self.steps[back] = (i, -1)
+            self.steps[fwd] = (i, 1)
 
     def actions(self, board: RushHourBoard) -> list[VehicleShift]:
-
-        shifts = {
-            Orientation.VERTICAL: [Direction.UP, Direction.DOWN],
-            Orientation.HORIZONTAL: [Direction.LEFT, Direction.RIGHT]
-        }
-
-        matrix = board.get_board()
-        actions = [VehicleShift(shift, vehicle.id)
-                   for vehicle in board.vehicles
-                   for shift in shifts[vehicle.orientation]
-                   if self.is_valid_move(matrix, vehicle, shift)]
+        layout = board.layout
+        occupied = board.occupied
+        key = board.key
+        bits = layout.bits
+        mask = (1 << bits) - 1
+        actions = []
+        for i, (back, fwd) in enumerate(self.shifts):
+            position = (key >> (i * bits)) & mask
+            behind = layout.behind[i][position]
+            if behind and not occupied & behind:
+                actions.append(back)
+            ahead = layout.ahead[i][position]
+            if ahead and not occupied & ahead:
+                actions.append(fwd)
         return actions
 
     def take_action(self, board: RushHourBoard, action: VehicleShift) -> RushHourBoard:
-        for vehicle in board.vehicles:
-            if vehicle.id == action.vehicle_id:
-                y = vehicle.y + action.shift.value[0]
-                x = vehicle.x + action.shift.value[1]
-                new_vehicle = RushHourVehicle(
-                    vehicle.id, x, y, vehicle.orientation, vehicle.length)
-                new_vehicles = deepcopy(board.vehicles)
-                new_vehicles.remove(vehicle)
-                new_vehicles.add(new_vehicle)
-                new_board = RushHourBoard(new_vehicles, board.shape)
-        return new_board
+        layout = board.layout
+        i, step = self.steps[action]
+        position = board.position(i)
+        cells = layout.cells[i]
+        occupied = board.occupied ^ cells[position] ^ cells[position + step]
+        return RushHourBoard(layout, board.key + (step << (i * layout.bits)), occupied)
 
     def action_cost(self, board: RushHourBoard, action: VehicleShift) -> float:
         return 1
 
     def is_goal(self, board: RushHourBoard) -> bool:
-        return self.goal in board.vehicles
+        return board.position(self.goal_index) == self.goal_key
+
+    @property
+    def state_size(self) -> int:
+        layout = self.initial.layout
+        return max(1, (len(layout.ids) * layout.bits + 7) // 8)
 
-    def on_board(self, x: int, y: int) -> bool:
-        board = self.initial.get_board()
-        return 0 <= x < board.shape[1] and 0 <= y < board.shape[0]
+    def encode(self, board: RushHourBoard) -> bytes:
+        return board.key.to_bytes(self.state_size, 'big')
 
-    def is_valid_move(self, matrix, vehicle: RushHourVehicle, shift: Direction):
-        y, x = shift.value
-        if self.on_board(vehicle.x+x, vehicle.y+y) and (shift == Direction.UP or Direction.LEFT) and matrix[vehicle.y+y, vehicle.x+x] == ' ':
-            return True
-        if self.on_board(vehicle.xEnd+x, vehicle.yEnd+y) and (shift == Direction.DOWN or Direction.RIGHT) and matrix[vehicle.yEnd+y, vehicle.xEnd+x] == ' ':
-            return True
-        return False
+    def decode(self, data: bytes) -> RushHourBoard:
+        return RushHourBoard(self.initial.layout, int.from_bytes(data, 'big'))
 
     def to_image(self, board: RushHourBoard, size: tuple[int, int] = (800, 800)) -> Image.Image:
         background_color = (248, 255, 229)
@@ -119,7 +134,7 @@ class RushHourProblem(Problem[RushHourBoard, VehicleShift]):
                     v, x, y, Orientation.VERTICAL, len(dy))
 
         initial_vehicles = set(vehicles.values())
-        initial = RushHourBoard(
+        initial = RushHourBoard.from_vehicles(
             initial_vehicles, cast(tuple[int, int], board.shape))
         goal = deepcopy(vehicles["X"])
         goal.x = width - vehicles["X"].length
@@ -1,49 +1,65 @@
 import argparse
+from base.cached_heuristic import CachedHeuristic, cache_report, cached
 from base.problem import ReversibleProblem
-from cli_config import VERSION, avl_algos, avl_heuristics, avl_problems, problem_heuristics, avl_reversible_problems
+from cli_config import VERSION, algorithm_problems, applicable, avl_algos, avl_heuristics, avl_problems, beam_algorithms, lazy_heuristic_algorithms, problem_heuristics, reversible_problems
 from typing import Union, cast
 from base.solver import HeuristicSolver, Solver, BidirectionalHeuristicSolver
 
 from tree.node import Node
 
 from pathlib import Path
+from tree.profile import SearchProfile, ProfiledHeuristic, unwrap_heuristic
 from tree.tree import NodeEvent, NodeEventSubscriber, Tree
+import json
 import time
 
 
+""" how often (in seconds) the monitors refresh the printed stats """
+STATS_INTERVAL = 0.1
+
+
 class SolvingMonitor(NodeEventSubscriber, Solver):
-    def __init__(self, solver: Solver, instance: Union[str, Path]) -> None:
+    def __init__(self, solver: Solver, instance: Union[str, Path], interval: float | None = STATS_INTERVAL,
+                 heuristic_caches: list[CachedHeuristic] | None = None) -> None:
         super().__init__(solver.problem)
         if isinstance(instance, Path):
             self.instance = instance.stem
         else:
             self.instance = Path(instance).stem
         self.solver = solver
-        self.solver.search_tree().subscribe(self)
+        self.heuristic_caches = heuristic_caches or []
+        self.tree = solver.search_tree()
+        self.stats = self.tree.enable_stats()
+        self.tree.subscribe(self, interval=interval)
+        self.wall_time = 0.0
         self._reset_stats()
 
     def solve(self) -> Node | None:
         self._reset_stats()
         self.print_header()
         result = self.solver.solve()
+        self.wall_time = time.time() - self.start_time
+        self.print_stats()
         self.print_footer(result)
         return result
 
     def search_tree(self) -> Tree:
-        return self.solver.search_tree()
+        return self.tree
 
     def _reset_stats(self):
         self.start_time = time.time()
-        self.closed_nodes = 0
-        self.opened_nodes = 1
+        self.stats.reset()
         self.wall_time = 0
 
+    @property
+    def closed_nodes(self) -> int:
+        return self.stats.closed
+
+    @property
+    def opened_nodes(self) -> int:
+        return 1 + self.stats.opened - self.stats.closed
+
     def got_event(self, node: Node, event: NodeEvent) -> None:
-        if event == NodeEvent.Closed:
-            self.closed_nodes += 1
-            self.opened_nodes -= 1
-        elif event == NodeEvent.Opened:
-            self.opened_nodes += 1
         self.wall_time = time.time() - self.start_time
         self.print_stats()
 
@@ -58,6 +74,9 @@ class SolvingMonitor(NodeEventSubscriber, Solver):
         heuristic = self._heuristic_name()
         if heuristic is not None:
             header += f"\n...heuristic:  {heuristic}"
+        lazy_heuristic = getattr(self.solver, "lazy_heuristic", None)
+        if lazy_heuristic is not None:
+            header += f"\n........lazy:  {unwrap_heuristic(lazy_heuristic).__class__.__name__}"
         header += f"\n____________________| SEARCH STATS |____________________"
         print(header)
 
@@ -69,14 +88,18 @@ class SolvingMonitor(NodeEventSubscriber, Solver):
 
     def _heuristic_name(self) -> str | None:
         if isinstance(self.solver, HeuristicSolver):
-            return self.solver.heuristic.__class__.__name__
+            return unwrap_heuristic(self.solver.heuristic).__class__.__name__
         elif isinstance(self.solver, BidirectionalHeuristicSolver):
-            return self.solver.primary_heuristic.__class__.__name__
+            return unwrap_heuristic(self.solver.primary_heuristic).__class__.__name__
         else:
             return None
 
     def print_footer(self, result:Node | None):
         print("\n--------------------------------------------------------")
+        if self.heuristic_caches:
+            report = cache_report(self.heuristic_caches)
+            hit_rate = f"{report['hit_rate']:.1%}" if report['hit_rate'] is not None else "-"
+            print(f"...heuristic cache: {report['hits']} hits, {report['misses']} misses ({hit_rate} hit rate)")
         if result is None:
             print(
                 "\n...failed to solve :(\n...either the problem is unsolvable or there is a bug in the solver")
@@ -118,6 +141,17 @@ def parse_args():
                         choices=avl_algos.keys(), help="name of the algorithm solver should use")
     parser.add_argument("-h", "--heuristic", choices=avl_heuristics.keys(),
                         help="name of the heuristic that should be used by the solver")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="file to write the per-phase search profile (JSON) to")
+    parser.add_argument("-l", "--lazy-heuristic", choices=avl_heuristics.keys(),
+                        help="expensive heuristic evaluated only for the nodes about to be expanded "
+                             "(the heuristic should be a cheap one then)")
+    parser.add_argument("--heuristic-cache", metavar="ENTRIES", type=int, default=0,
+                        help="memoize up to that many heuristic values (least recently used are evicted)")
+    parser.add_argument("--beam-width", metavar="NODES", type=int,
+                        help="number of the nodes the beam searches keep in every layer")
+    parser.add_argument("--beam-depth", metavar="LAYERS", type=int,
+                        help="number of the layers after which the beam searches give up")
     return parser.parse_args()
 
 
@@ -140,6 +174,15 @@ if __name__ == "__main__":
         exit(-1)
 
     algorithm:Solver | None = None
+    heuristic_caches: list[CachedHeuristic] = []
+    profile = SearchProfile() if args.profile else None
+    solved_problem = profile.instrument(problem) if profile is not None else problem
+
+    if not applicable(args.algorithm, args.problem):
+        print("> Chosen algorithm is specialized and doesn't apply to the given problem!")
+        print(
+            f"> Tip: it works with: {', '.join(algorithm_problems[args.algorithm])}")
+        exit(-1)
 
     requires_heuristic = issubclass(algorithm_class, HeuristicSolver) \
         or issubclass(algorithm_class, BidirectionalHeuristicSolver)
@@ -150,32 +193,89 @@ if __name__ == "__main__":
             print("> Chosen algorithm requires a heuristic, please specify it!")
             exit(-1)
 
-        heuristic_class = avl_heuristics[args.heuristic]
-
-        if heuristic_class not in problem_heuristics[problem_class]:
+        if args.heuristic not in problem_heuristics[args.problem]:
             print(
                 "> Chosen heuristic doesn't apply to the given problem. Choose another!")
             print(
                 "> Lifehack: names of heuristics and related problems are pretty similar :)")
             exit(-1)
 
+        heuristic_class = avl_heuristics[args.heuristic]
+
+        if args.lazy_heuristic is not None:
+            if args.algorithm not in lazy_heuristic_algorithms:
+                print("> Chosen algorithm doesn't evaluate a lazy heuristic!")
+                print(f"> Tip: the algorithms that do are: {', '.join(lazy_heuristic_algorithms)}")
+                exit(-1)
+            if args.lazy_heuristic not in problem_heuristics[args.problem]:
+                print("> Chosen lazy heuristic doesn't apply to the given problem. Choose another!")
+                exit(-1)
+
+        if (args.beam_width is not None or args.beam_depth is not None) and args.algorithm not in beam_algorithms:
+            print("> Chosen algorithm isn't a beam search, it has neither the width nor the depth limit!")
+            print(f"> Tip: the beam searches are: {', '.join(beam_algorithms)}")
+            exit(-1)
+
         if requires_reversing and not isinstance(problem, ReversibleProblem):
             print("> Chosen algorithm is directional, requires a reversible problem!")
             print(
-                f"> Tip: reversible problems are: {', '.join(avl_reversible_problems)}")
+                f"> Tip: reversible problems are: {', '.join(reversible_problems())}")
             exit(-1)
 
         if requires_reversing:
             assert issubclass(algorithm_class, BidirectionalHeuristicSolver)
             assert isinstance(problem, ReversibleProblem)
-            algorithm = algorithm_class(problem, heuristic_class(
-                problem), heuristic_class(problem.reversed()))
+            primary_heuristic, opposite_heuristic = heuristic_class(problem), heuristic_class(problem.reversed())
+            if args.heuristic_cache > 0:
+                primary_heuristic = cached(primary_heuristic, problem, args.heuristic_cache)
+                opposite_heuristic = cached(opposite_heuristic, problem, args.heuristic_cache)
+                heuristic_caches += [primary_heuristic, opposite_heuristic]
+            if profile is not None:
+                primary_heuristic = ProfiledHeuristic(primary_heuristic, profile)
+                opposite_heuristic = ProfiledHeuristic(opposite_heuristic, profile)
+            algorithm = algorithm_class(solved_problem, primary_heuristic, opposite_heuristic)
         else:
             assert issubclass(algorithm_class, HeuristicSolver)
-            algorithm = algorithm_class(problem, heuristic_class(problem))
+            heuristic = heuristic_class(problem)
+            lazy_heuristic = avl_heuristics[args.lazy_heuristic](problem) if args.lazy_heuristic is not None else None
+            if args.heuristic_cache > 0:
+                heuristic = cached(heuristic, problem, args.heuristic_cache)
+                heuristic_caches.append(heuristic)
+                if lazy_heuristic is not None:
+                    lazy_heuristic = cached(lazy_heuristic, problem, args.heuristic_cache)
+                    heuristic_caches.append(lazy_heuristic)
+            if profile is not None:
+                heuristic = ProfiledHeuristic(heuristic, profile)
+                if lazy_heuristic is not None:
+                    lazy_heuristic = ProfiledHeuristic(lazy_heuristic, profile)
+            if lazy_heuristic is not None:
+                from solvers.astar import AStar
+                from solvers.weighted_astar import WeightedAStar
+                assert issubclass(algorithm_class, (AStar, WeightedAStar))
+                algorithm = algorithm_class(solved_problem, heuristic, lazy_heuristic=lazy_heuristic)
+            elif args.algorithm in beam_algorithms:
+                from solvers.beam_search import DEFAULT_BEAM_DEPTH, DEFAULT_BEAM_WIDTH, Beam, BreadthFirstBeam
+                assert issubclass(algorithm_class, (Beam, BreadthFirstBeam))
+                algorithm = algorithm_class(solved_problem, heuristic,
+                                            width=args.beam_width or DEFAULT_BEAM_WIDTH,
+                                            max_depth=args.beam_depth or DEFAULT_BEAM_DEPTH)
+            else:
+                algorithm = algorithm_class(solved_problem, heuristic)
     else:
-        algorithm = algorithm_class(problem)
+        algorithm = algorithm_class(solved_problem)
 
     assert algorithm is not None
-    solver_monitor = SolvingMonitor(algorithm, instance)
-    solver_monitor.solve()
+    if profile is not None:
+        algorithm.search_tree().enable_profile(profile)
+        profile.heuristic_caches = heuristic_caches
+    solver_monitor = SolvingMonitor(algorithm, instance, heuristic_caches=heuristic_caches)
+    result = solver_monitor.solve()
+
+    if profile is not None:
+        with open(args.profile, "w") as profile_file:
+            json.dump({"problem": solver_monitor._problem_name(),
+                       "instance": solver_monitor.instance,
+                       "algorithm": solver_monitor._solver_name(),
+                       "heuristic": solver_monitor._heuristic_name(),
+                       **profile.report(solver_monitor.wall_time, result)}, profile_file, indent=2)
+        print(f"...profile: {args.profile}")
@@ -1,8 +1,30 @@
-from solvers.breadth_first import BFS
-from solvers.depth_first_iter import DFSIter
-from solvers.depth_first_recursive import DFSRecursive
-from solvers.dijkstra import Dijkstra
-from solvers.greedy import Greedy
-from solvers.astar import AStar
+import importlib
 
+# the solver modules are imported on the first access, so importing a single solver doesn't import all of them
+_solver_modules = {
+    "BFS": "solvers.breadth_first",
+    "ExternalBFS": "solvers.external_breadth_first",
+    "DFSIter": "solvers.depth_first_iter",
+    "DFS": "solvers.depth_first",
+    "IDDFS": "solvers.depth_first",
+    "DFSRecursive": "solvers.depth_first_recursive",
+    "Dijkstra": "solvers.dijkstra",
+    "Greedy": "solvers.greedy",
+    "AStar": "solvers.astar",
+    "WeightedAStar": "solvers.weighted_astar",
+    "ARAStar": "solvers.anytime_astar",
+    "HDAStar": "solvers.hda_star",
+    "Beam": "solvers.beam_search",
+    "BreadthFirstBeam": "solvers.beam_search",
+    "IDAStar": "solvers.idastar",
+    "JPS": "solvers.jump_point_search",
+    "RushHourLookup": "solvers.rush_hour_lookup",
+}
 
+__all__ = list(_solver_modules)
+
+
+def __getattr__(name: str):
+    if name not in _solver_modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_solver_modules[name]), name)
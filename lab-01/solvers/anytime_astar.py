@@ -0,0 +1,32 @@
+from base.heuristic import Heuristic
+from base.problem import Problem
+from base.solver import AnytimeHeuristicSolver
+from solvers.generic.anytime_best_first import AnytimeBestFirstSearch
+from tree.tree import Tree
+from tree.node import Node
+
+
+DEFAULT_INITIAL_WEIGHT = 3.0
+DEFAULT_WEIGHT_STEP = 0.5
+
+
+class ARAStar(AnytimeHeuristicSolver):
+    """
+    Anytime Repairing A*: quickly finds a solution with a heavily weighted heuristic,
+    then keeps improving it with smaller weights, reusing the previous search effort.
+    Run to completion it returns the optimal solution (for an admissible heuristic),
+    interrupted it leaves the best solution found so far in the `incumbent`.
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic,
+                 initial_weight: float = DEFAULT_INITIAL_WEIGHT, weight_step: float = DEFAULT_WEIGHT_STEP):
+        super().__init__(problem, heuristic)
+        self.search = AnytimeBestFirstSearch(problem, heuristic, initial_weight, weight_step)
+
+    def solve(self) -> Node | None:
+        for self.incumbent, self.bound in self.search.improve():
+            pass
+        return self.incumbent
+
+    def search_tree(self) -> Tree:
+        return self.search.tree
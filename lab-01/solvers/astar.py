@@ -7,9 +7,15 @@ from tree.node import Node
 
 
 class AStar(HeuristicSolver):
-    def __init__(self, problem: Problem, heuristic: Heuristic):
+    """
+    A* ranking the nodes by f = g + h. If a `lazy_heuristic` is given, the `heuristic` should be a cheap one:
+    the expensive lazy heuristic is evaluated only for the nodes about to be expanded (see :class:`BestFirstSearch`).
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, lazy_heuristic: Heuristic | None = None):
         super().__init__(problem, heuristic)
-        self.search = BestFirstSearch(problem, lambda node: node.cost + heuristic(node.state))
+        self.lazy_heuristic = lazy_heuristic
+        self.search = BestFirstSearch(problem, heuristic, lambda h, cost: cost + h, lazy_heuristic)
 
     def solve(self) -> Node | None:
         return self.search.solve()
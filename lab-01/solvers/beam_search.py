@@ -0,0 +1,53 @@
+from base.heuristic import Heuristic
+from base.problem import Problem
+from base.solver import HeuristicSolver
+from solvers.generic.beam import BeamSearch
+from tree.node import Node
+from tree.tree import Tree
+
+
+DEFAULT_BEAM_WIDTH = 100
+""" number of the layers after which the beam search gives up, without the closed list it could wander forever """
+DEFAULT_BEAM_DEPTH = 1000
+
+
+class Beam(HeuristicSolver):
+    """
+    Beam search: every layer keeps only the `width` nodes with the best heuristic values.
+    A fast plan generator for the huge state spaces: both the memory and the time per layer are bounded,
+    but the solution doesn't have to be optimal and it may be not found at all
+    (the search gives up after `max_depth` layers).
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, width: int = DEFAULT_BEAM_WIDTH,
+                 max_depth: int = DEFAULT_BEAM_DEPTH):
+        super().__init__(problem, heuristic)
+        self.width = width
+        self.max_depth = max_depth
+        self.search = BeamSearch(problem, heuristic, lambda h, cost: h, width, max_depth)
+
+    def solve(self) -> Node | None:
+        return self.search.solve()
+
+    def search_tree(self) -> Tree:
+        return self.search.tree
+
+
+class BreadthFirstBeam(HeuristicSolver):
+    """
+    Breadth-first beam search: works same as :class:`Beam`, but the nodes are ranked by f = g + h,
+    which usually gives cheaper solutions when the action costs differ.
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, width: int = DEFAULT_BEAM_WIDTH,
+                 max_depth: int = DEFAULT_BEAM_DEPTH):
+        super().__init__(problem, heuristic)
+        self.width = width
+        self.max_depth = max_depth
+        self.search = BeamSearch(problem, heuristic, lambda h, cost: cost + h, width, max_depth)
+
+    def solve(self) -> Node | None:
+        return self.search.solve()
+
+    def search_tree(self) -> Tree:
+        return self.search.tree
@@ -0,0 +1,93 @@
+from typing import Iterator
+from base.solver import P, Solver
+from base.state import State
+from tree import Node, Tree
+
+
+class DFS(Solver):
+    """
+    Depth-first search with an explicit stack, so the depth of the search isn't capped by the recursion limit.
+
+    The stack holds the children generators (:meth:`Tree.expand`) of the nodes on the current path,
+    so the nodes are explored and the tree events are emitted in the same order as the recursive search would:
+    a node is closed, then its children are opened one by one and every child is searched before the next one is opened.
+
+    Without the `depth_limit` every visited state is remembered and never searched again.
+    With the `depth_limit` a state is skipped only if it's already on the current path (kept in a set, so the check is O(1)),
+    because a state reached first by a long path may be worth searching again from a shorter one.
+    Nodes deeper than the limit are checked for being the goal, but aren't expanded.
+    `iterative_deepening` runs the depth-limited search with the limit 1, 2, 3... (starting from the `depth_limit` if given)
+    until it finds a solution or no node was cut off by the limit.
+    If the tree has a profile enabled, the visited (or on path) states lookups are timed.
+    """
+
+    def __init__(self, problem: P, depth_limit: int | None = None, iterative_deepening: bool = False):
+        super().__init__(problem)
+        self.start = problem.initial
+        self.depth_limit = depth_limit
+        self.iterative_deepening = iterative_deepening
+        self.root = Node(self.start)
+        self.tree = Tree(self.root)
+
+    def solve(self) -> Node | None:
+        if self.problem.is_goal(self.start):
+            return self.root
+        if not self.iterative_deepening:
+            solution, _ = self._search(self.depth_limit)
+            return solution
+
+        limit = self.depth_limit or 1
+        while True:
+            solution, cut_off = self._search(limit)
+            if solution is not None or not cut_off:
+                return solution
+            limit += 1
+
+    def search_tree(self) -> Tree:
+        return self.tree
+
+    def _search(self, limit: int | None) -> tuple[Node | None, bool]:
+        """ returns the solution (if found) and whether any node was left unexpanded because of the limit """
+        problem, tree = self.problem, self.tree
+        # all the visited states without the limit, only the current path with it
+        seen: set[State] = {self.start}
+        on_path_only = limit is not None
+        contains, add = seen.__contains__, seen.add
+        profile = tree.profile
+        if profile is not None:
+            contains, add = profile.timed('visited', contains), profile.timed('visited', add)
+
+        path: list[Node] = [self.root]
+        stack: list[Iterator[Node]] = [tree.expand(problem, self.root)]
+        cut_off = False
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                if on_path_only:
+                    seen.discard(path[-1].state)
+                path.pop()
+                continue
+            if problem.is_goal(child.state):
+                return child, cut_off
+            if contains(child.state):
+                continue
+            if limit is not None and len(path) >= limit:
+                cut_off = True
+                continue
+            add(child.state)
+            path.append(child)
+            stack.append(tree.expand(problem, child))
+            if profile is not None:
+                profile.frontier_size(len(stack))
+        return None, cut_off
+
+
+class IDDFS(DFS):
+    """
+    Iterative deepening depth-first search: finds the shallowest solution
+    using only the memory proportional to its depth (see :class:`DFS`).
+    """
+
+    def __init__(self, problem: P):
+        super().__init__(problem, iterative_deepening=True)
@@ -1,3 +1,4 @@
+from base.heuristic import NoHeuristic
 from base.solver import Solver
 from solvers.generic.best_first import BestFirstSearch
 from tree.node import Node
@@ -7,7 +8,7 @@ from tree.tree import Tree
 class Dijkstra(Solver):
     def __init__(self, problem):
         super().__init__(problem)
-        self.search = BestFirstSearch(problem, eval_fun=lambda node: node.cost)
+        self.search = BestFirstSearch(problem, NoHeuristic(), lambda h, cost: cost)
     
     def solve(self) -> Node | None:
         return self.search.solve()
@@ -0,0 +1,132 @@
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from base.problem import EncodableProblem
+from base.solver import Solver
+from solvers.generic.layer_files import SortedRecordFile, difference, merge_unique
+from tree.node import Node
+from tree.tree import NodeEvent, Tree
+
+
+""" number of the generated states kept in the memory before they are written to the disk """
+DEFAULT_BUFFER_SIZE = 2**20
+
+
+class ExternalBFS(Solver):
+    """
+    Breadth-first search with the layers kept on the disk instead of the visited set in the memory,
+    duplicates are detected with a delay: only once the whole next layer is generated.
+
+    Every layer is a file of the sorted, unique encoded states (see :class:`EncodableProblem`).
+    The successors of a layer are collected in a buffer of `buffer_size` states, every full buffer
+    is sorted and written as a run file. The runs are merged and the states of the current
+    and the previous layer are subtracted, which removes all the duplicates as long as every action
+    can be undone (the state space is undirected, as in all the bundled problems).
+    In a directed space old states may be expanded again; the solution is still the shallowest one,
+    but an unsolvable instance may never end.
+
+    All the layers are kept until the search ends, because the solution path is recovered backwards:
+    the parent of a state is its successor found in the previous layer.
+    Nodes reported to the tree have no parents and their cost is the number of their layer.
+    If the tree has a profile enabled, merging the layers is timed as the `visited` phase.
+    """
+
+    def __init__(self, problem: EncodableProblem, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 directory: str | None = None):
+        super().__init__(problem)
+        self.buffer_size = buffer_size
+        self.directory = directory
+        self.root = Node(problem.initial)
+        self.tree = Tree(self.root)
+        self.layers: list[SortedRecordFile] = []
+
+    def solve(self) -> Node | None:
+        problem = self.problem
+        if problem.is_goal(self.root.state):
+            return self.root
+
+        with tempfile.TemporaryDirectory(prefix="external-bfs-", dir=self.directory) as workdir:
+            self.layers = [self._layer_file(Path(workdir), 0)]
+            self.layers[0].write([problem.encode(self.root.state)])
+            while len(self.layers[-1]) > 0:
+                found = self._expand_layer(Path(workdir))
+                if found is not None:
+                    return self._trace_back(*found)
+            return None
+
+    def search_tree(self) -> Tree:
+        return self.tree
+
+    def _layer_file(self, workdir: Path, depth: int) -> SortedRecordFile:
+        return SortedRecordFile(workdir / f"layer-{depth}.bin", self.problem.state_size)
+
+    def _expand_layer(self, workdir: Path) -> tuple[Any, Any, Any] | None:
+        """
+        writes the successors of the last layer as the next one,
+        returns (parent, action, goal) as soon as a goal is generated
+        """
+        problem, tree = self.problem, self.tree
+        encode, decode = problem.encode, problem.decode
+        depth = len(self.layers) - 1
+        runs: list[SortedRecordFile] = []
+        buffer: set[bytes] = set()
+
+        for record in self.layers[depth]:
+            state = decode(record)
+            monitored = tree.dispatching
+            if monitored:
+                tree._notify_lazy(lambda: Node(state, cost=depth), NodeEvent.Closed)
+            for action in problem.actions(state):
+                child = problem.take_action(state, action)
+                if monitored:
+                    tree._notify_lazy(lambda: Node(child, cost=depth + 1), NodeEvent.Opened)
+                if problem.is_goal(child):
+                    return state, action, child
+                buffer.add(encode(child))
+            if len(buffer) >= self.buffer_size:
+                runs.append(self._write_run(workdir, len(runs), buffer))
+                buffer = set()
+
+        merge = self._merge_layer
+        if tree.profile is not None:
+            merge = tree.profile.timed('visited', merge)
+        merge(self._layer_file(workdir, depth + 1), runs, sorted(buffer))
+        if tree.profile is not None:
+            tree.profile.frontier_size(len(self.layers[-1]))
+        return None
+
+    def _write_run(self, workdir: Path, number: int, buffer: set[bytes]) -> SortedRecordFile:
+        run = SortedRecordFile(workdir / f"run-{number}.bin", self.problem.state_size)
+        run.write(sorted(buffer))
+        return run
+
+    def _merge_layer(self, layer: SortedRecordFile, runs: list[SortedRecordFile], last_run: list[bytes]) -> None:
+        """ writes the merged runs without the states of the two last layers as the new layer """
+        records = merge_unique([*runs, last_run])
+        for previous in self.layers[-2:]:
+            records = difference(records, previous)
+        layer.write(records)
+        for run in runs:
+            run.remove()
+        self.layers.append(layer)
+
+    def _trace_back(self, parent: Any, action: Any, goal: Any) -> Node:
+        """ recovers the path to the goal, whose parent belongs to the last layer, layer by layer """
+        problem = self.problem
+        encode = problem.encode
+        steps = [(action, goal)]
+        state = parent
+        for layer in reversed(self.layers[:-1]):
+            encoded = encode(state)
+            predecessor = next(p for p in (problem.take_action(state, a) for a in problem.actions(state))
+                               if encode(p) in layer)
+            action = next(a for a in problem.actions(predecessor)
+                          if encode(problem.take_action(predecessor, a)) == encoded)
+            steps.append((action, state))
+            state = predecessor
+
+        node = self.root
+        for action, state in reversed(steps):
+            node = Node(state, node, action, node.cost + problem.action_cost(node.state, action))
+        return node
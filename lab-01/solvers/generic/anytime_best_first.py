@@ -0,0 +1,131 @@
+from typing import Generator
+from base.heuristic import Heuristic
+from base.problem import Problem
+from base.state import State
+from solvers.generic.best_first import BestFirstSearch
+from tree import Node
+from tree.tree import NodeEvent
+
+
+class AnytimeBestFirstSearch(BestFirstSearch):
+    """
+    Anytime Repairing A* (ARA*) built on the :class:`BestFirstSearch`.
+
+    Runs a series of weighted A* searches (f = g + weight * h) with the weight decreasing by `weight_step`
+    down to 1, each one yielding a solution at most `weight` times worse than the optimal one.
+    The searches don't start from scratch: the node store, the path costs and the frontier are reused.
+    Within an iteration a state is expanded at most once, a closed state reached with a cheaper path
+    is remembered as inconsistent and moved back into the frontier at the beginning of the next iteration.
+    An iteration stops as soon as no frontier node can beat the current solution.
+
+    `closed` holds states expanded in the current iteration,
+    `inconsistent` maps the states that have to be reexpanded in the next iteration to their nodes.
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, initial_weight: float, weight_step: float):
+        self.weight = max(1.0, initial_weight)
+        self.weight_step = weight_step
+        super().__init__(problem, heuristic, lambda h, cost: cost + self.weight * h)
+        self.closed: set[State] = set()
+        self.inconsistent: dict[State, int] = {}
+
+    def improve(self) -> Generator[tuple[Node, float], None, None]:
+        """ yields the solution after every iteration along with its suboptimality bound, the last one is optimal """
+        if self.problem.is_goal(self.start):
+            yield self.root, 1.0
+            return
+
+        self._estimate_new()
+        self._push(0)
+        goal = None
+        while True:
+            found = self._improve_path(goal)
+            if found is None and goal is None:
+                return
+            goal = found if found is not None else goal
+            assert goal is not None
+            bound = self._suboptimality_bound(goal)
+            yield self.store.node(goal), bound
+            if bound <= 1:
+                return
+            self.weight = max(1.0, self.weight - self.weight_step)
+            self._next_iteration()
+
+    def solve(self) -> Node | None:
+        solution = None
+        for solution, _ in self.improve():
+            pass
+        return solution
+
+    def _improve_path(self, goal: int | None) -> int | None:
+        """ weighted A* iteration, returns index of a better goal node or None if there's none """
+        problem, store, tree, visited = self.problem, self.store, self.tree, self.visited
+        states, closed, inconsistent = store.states, self.closed, self.inconsistent
+        goal_cost = store.costs[goal] if goal is not None else float('inf')
+        children: list[tuple[int, bool]] = []
+        lookup, record, is_closed = visited.get, visited.__setitem__, closed.__contains__
+        push, pop = self._push, self._pop
+        profile = tree.profile
+        if profile is not None:
+            lookup, record = profile.timed('visited', lookup), profile.timed('visited', record)
+            is_closed = profile.timed('visited', is_closed)
+            push, pop = profile.timed('queue', push), profile.timed('queue', pop)
+
+        while not self.frontier.is_empty():
+            index = pop()
+            if self._evaluate(index) >= goal_cost:
+                push(index)
+                return None
+            state = states[index]
+            if problem.is_goal(state):
+                return index
+            closed.add(state)
+
+            monitored = tree.dispatching
+            if monitored:
+                tree._notify_lazy(lambda: store.node(index), NodeEvent.Closed)
+            cost = store.costs[index]
+            for action in problem.actions(state):
+                child = problem.take_action(state, action)
+                child_cost = cost + problem.action_cost(state, action)
+                if monitored:
+                    tree._notify_lazy(lambda: Node(child, store.node(index), action, child_cost), NodeEvent.Opened)
+                known = lookup(child)
+                if known is not None and child_cost >= known:
+                    continue
+                record(child, child_cost)
+                child_index = store.add(child, index, action, child_cost)
+                if is_closed(child):
+                    inconsistent[child] = child_index
+                    self.reopened += 1
+                    if profile is not None:
+                        profile.reopened += 1
+                else:
+                    children.append((child_index, known is not None))
+            self._estimate_new()
+            for child_index, replace in children:
+                push(child_index, replace)
+            children.clear()
+            if profile is not None:
+                profile.frontier_size(len(self.frontier))
+        return None
+
+    def _suboptimality_bound(self, goal: int) -> float:
+        """ the goal cost divided by the lower bound of the optimal cost, but not more than the weight """
+        costs, h_values = self.store.costs, self.h_values
+        candidates = self.frontier.items() + list(self.inconsistent.values())
+        if not candidates:
+            return 1.0
+        lower_bound = min(costs[i] + h_values[i] for i in candidates)
+        if lower_bound <= 0:
+            return self.weight
+        return max(1.0, min(self.weight, costs[goal] / lower_bound))
+
+    def _next_iteration(self) -> None:
+        """ moves the inconsistent states into the frontier, which is reordered for the new weight """
+        queued = self.frontier.items() + list(self.inconsistent.values())
+        self.inconsistent.clear()
+        self.closed.clear()
+        self.frontier = self._new_frontier()
+        for index in queued:
+            self._push(index)
@@ -0,0 +1,73 @@
+import heapq
+from typing import Callable
+from base.heuristic import Heuristic
+from base.problem import Problem
+from base.state import State
+from tree import Node, Tree
+
+
+class BeamSearch:
+    """
+    Breadth-first search keeping only the `width` best nodes (the lowest evaluation) of every layer.
+    The evaluation function gets the heuristic value and the path cost of a node,
+    the heuristic is evaluated by a single :meth:`Heuristic.batch` call for the whole layer.
+
+    There is no closed list: a generated state is dropped only if it belongs to the layer being expanded
+    or to the one before it (which removes the moves undone right away), or if it has been already generated
+    in the same layer with a lower cost. So the memory is bounded by the width times the depth of the paths
+    and the time of every layer by the width times the branching factor.
+    The search is incomplete: the goal may fall out of the beam and, without the closed list,
+    it could wander around forever if it can't find one, so it gives up after `max_depth` layers.
+    If the tree has a profile enabled, selecting the beam is timed as the `queue` phase.
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, eval_fun: Callable[[float, float], float], width: int,
+                 max_depth: int):
+        self.problem = problem
+        self.heuristic = heuristic
+        self.eval_fun = eval_fun
+        self.width = width
+        self.max_depth = max_depth
+        self.root = Node(problem.initial)
+        self.tree = Tree(self.root)
+
+    def solve(self) -> Node | None:
+        problem, tree, heuristic, eval_fun = self.problem, self.tree, self.heuristic, self.eval_fun
+        if problem.is_goal(self.root.state):
+            return self.root
+
+        select = self._select
+        profile = tree.profile
+        if profile is not None:
+            select = profile.timed('queue', select)
+        layer = [self.root]
+        excluded = {self.root.state}
+
+        for _ in range(self.max_depth):
+            if not layer:
+                break
+            candidates: dict[State, Node] = {}
+            for node in layer:
+                for child in tree.expand(problem, node):
+                    state = child.state
+                    if problem.is_goal(state):
+                        return child
+                    if state in excluded:
+                        continue
+                    known = candidates.get(state)
+                    if known is None or child.cost < known.cost:
+                        candidates[state] = child
+            if profile is not None:
+                profile.frontier_size(len(candidates))
+            expanded = {node.state for node in layer}
+            nodes = list(candidates.values())
+            h_values = heuristic.batch([node.state for node in nodes])
+            layer = select([(eval_fun(h, node.cost), node) for h, node in zip(h_values, nodes)])
+            excluded = expanded | {node.state for node in layer}
+        return None
+
+    def _select(self, candidates: list[tuple[float, Node]]) -> list[Node]:
+        """ the best `width` nodes, ties are broken in the generation order """
+        best = heapq.nsmallest(self.width, candidates, key=lambda candidate: candidate[0])
+        return [node for _, node in best]
+
@@ -1,39 +1,157 @@
+from array import array
 from typing import Callable, Optional
+from base.heuristic import Heuristic
 from base.problem import Problem
 from base.state import State
-from solvers.utils import PriorityQueue
+from solvers.utils import BucketPriorityQueue, IndexedPriorityQueue, NonIntegralKeyError
 from tree import Node, Tree
+from tree.node_store import NodeStore
+from tree.tree import NodeEvent
 
 
 class BestFirstSearch:
     """
     Type of search that have access to problem definition and to heuristic, that allows it estimate
     which nodes should be searched.
+
+    The evaluation function gets the heuristic value and the path cost of a node.
+    Generated nodes live in a :class:`NodeStore`, so the frontier holds only their indices
+    and a :class:`Node` is built just for the returned solution (and for the tree subscribers).
+    The heuristic values are kept in `h_values` (parallel to the store), they are computed
+    by a single :meth:`Heuristic.batch` call for all the children of an expanded node.
+
+    The `heuristic` may be paired with an expensive `lazy_heuristic`, evaluated only for the nodes
+    reaching the top of the frontier — most of the generated nodes are never expanded, so they never pay for it.
+    The value of a node becomes the maximum of both heuristics and, if it has grown, the node is pushed back.
+    The maximum of admissible heuristics is admissible, so A* stays optimal.
+    `reinserted` counts the nodes pushed back this way.
+
+    The frontier is addressable (one node per state), so finding a cheaper path
+    to a queued state decreases its key instead of pushing a duplicate.
+    As long as the evaluation function returns non-negative integers (unit or integral costs
+    and an integral heuristic) the frontier is a bucket queue with O(1) push and pop,
+    ties are broken in the LIFO order, so the most recently generated (usually deeper) node goes first.
+    The first non-integral value switches the frontier to an addressable heap,
+    which breaks ties in favour of the larger path cost, i.e. for A* the node with the smaller heuristic value.
+    `reopened` counts the closed states that had to be queued again, because a cheaper path was found.
+    If the tree has a profile enabled, the visited states lookups and the frontier operations are timed.
     """
 
-    def __init__(self, problem: Problem, eval_fun: Callable[[Node], float]):
+    def __init__(self, problem: Problem, heuristic: Heuristic, eval_fun: Callable[[float, float], float],
+                 lazy_heuristic: Heuristic | None = None):
         self.problem = problem
         self.start: State = problem.initial
         self.root = Node(self.start)
-        self.frontier: PriorityQueue = PriorityQueue(eval_fun)
-        self.visited = {self.start: float(self.root.cost)}
+        self.store: NodeStore = NodeStore(self.start, self.root.cost)
+        self.heuristic = heuristic
+        self.lazy_heuristic = lazy_heuristic
+        self.h_values = array('d')
+        # `refined[i]` is set once the lazy heuristic has been evaluated for the i-th node
+        self.refined = bytearray()
+        self.eval_fun = eval_fun
+        self.frontier: BucketPriorityQueue[int] | IndexedPriorityQueue[int] = self._new_frontier()
+        self.visited = {self.start: self.root.cost}
+        self.reopened = 0
+        self.reinserted = 0
         self.tree = Tree(self.root)
 
     def solve(self) -> Node | None:
         if self.problem.is_goal(self.start):
             return self.root
-            
-        self.frontier.push(self.root)
+
+        problem, store, tree, visited = self.problem, self.store, self.tree, self.visited
+        states, h_values, refined, lazy_heuristic = store.states, self.h_values, self.refined, self.lazy_heuristic
+        lookup, record = visited.get, visited.__setitem__
+        push, pop, queued = self._push, self._pop, self._queued
+        children: list[tuple[int, bool]] = []
+        profile = tree.profile
+        if profile is not None:
+            lookup, record = profile.timed('visited', lookup), profile.timed('visited', record)
+            push, pop, queued = profile.timed('queue', push), profile.timed('queue', pop), profile.timed('queue', queued)
+        self._estimate_new()
+        push(0)
 
         while not self.frontier.is_empty():
-            node = self.frontier.pop()
-
-            if self.problem.is_goal(node.state):
-                return node
-            
-            for child in self.tree.expand(self.problem, node):
-                if child.state not in self.visited or child.cost < self.visited[child.state]:
-                    self.visited[child.state] = child.cost
-                    self.frontier.push(child)
-                    
-        return None
\ No newline at end of file
+            index = pop()
+            state = states[index]
+
+            if problem.is_goal(state):
+                return store.node(index)
+            if lazy_heuristic is not None and not refined[index]:
+                refined[index] = 1
+                h = lazy_heuristic(state)
+                if h > h_values[index]:
+                    h_values[index] = h
+                    self.reinserted += 1
+                    if profile is not None:
+                        profile.reinserted += 1
+                    push(index)
+                    continue
+
+            monitored = tree.dispatching
+            if monitored:
+                tree._notify_lazy(lambda: store.node(index), NodeEvent.Closed)
+            cost = store.costs[index]
+            for action in problem.actions(state):
+                child = problem.take_action(state, action)
+                child_cost = cost + problem.action_cost(state, action)
+                if monitored:
+                    tree._notify_lazy(lambda: Node(child, store.node(index), action, child_cost), NodeEvent.Opened)
+                known = lookup(child)
+                if known is None:
+                    record(child, child_cost)
+                    children.append((store.add(child, index, action, child_cost), False))
+                elif child_cost < known:
+                    if not queued(child):
+                        self.reopened += 1
+                        if profile is not None:
+                            profile.reopened += 1
+                    record(child, child_cost)
+                    children.append((store.add(child, index, action, child_cost), True))
+            if children:
+                self._estimate_new()
+                for child_index, replace in children:
+                    push(child_index, replace)
+                children.clear()
+            if profile is not None:
+                profile.frontier_size(len(self.frontier))
+
+        return None
+
+    def _estimate_new(self) -> None:
+        """ evaluates the heuristic for all the nodes added to the store since the last call, at once """
+        h_values, states = self.h_values, self.store.states
+        if len(h_values) < len(states):
+            self.refined.extend(bytes(len(states) - len(h_values)))
+            h_values.extend(self.heuristic.batch(states[len(h_values):]))
+
+    def _evaluate(self, index: int) -> float:
+        return self.eval_fun(self.h_values[index], self.store.costs[index])
+
+    def _new_frontier(self) -> BucketPriorityQueue[int]:
+        return BucketPriorityQueue(key=self._evaluate, address=self.store.states.__getitem__)
+
+    def _pop(self) -> int:
+        return self.frontier.pop()
+
+    def _queued(self, state: State) -> bool:
+        return state in self.frontier
+
+    def _push(self, index: int, replace: bool = False) -> None:
+        try:
+            if replace:
+                self.frontier.replace(index)
+            else:
+                self.frontier.push(index)
+        except NonIntegralKeyError:
+            self._switch_to_heap()
+            self._push(index, replace)
+
+    def _switch_to_heap(self) -> None:
+        evaluate, store = self._evaluate, self.store
+        heap: IndexedPriorityQueue[int] = IndexedPriorityQueue(
+            key=lambda index: (evaluate(index), -store.costs[index]),
+            address=store.states.__getitem__)
+        for index in self.frontier.items():
+            heap.push(index)
+        self.frontier = heap
@@ -6,7 +6,7 @@ from base.problem import ReversibleProblem, Problem
 from base.state import State
 from solvers.utils import PriorityQueue
 from tree.node import Node
-from tree.tree import NodeEventSubscriber, Tree, NodeEvent
+from tree.tree import NodeEventSubscriber, Tree, NodeEvent, TreeStats
 
 
 class SearchProcess():
@@ -179,12 +179,28 @@ class SearchProcess():
 class BidirectionalSearchTreeProxy(Tree, NodeEventSubscriber):
     """
     Wrapper over the search tree to handle bidirectional search
+    It listens to the wrapped trees only after somebody subscribes to it,
+    so an unmonitored search doesn't dispatch any events.
     """
 
     def __init__(self, forward_tree: Tree, backward_tree: Tree):
-        self.subscribers = []
-        forward_tree.subscribe(self)
-        backward_tree.subscribe(self)
+        self._init_dispatch()
+        self.trees = (forward_tree, backward_tree)
+        self.listening = False
+
+    def subscribe(self, subscriber: NodeEventSubscriber, every: int | None = None, interval: float | None = None) -> None:
+        self._listen()
+        super().subscribe(subscriber, every, interval)
+
+    def enable_stats(self) -> TreeStats:
+        self._listen()
+        return super().enable_stats()
+
+    def _listen(self) -> None:
+        if not self.listening:
+            self.listening = True
+            for tree in self.trees:
+                tree.subscribe(self)
 
     @property
     def root(self):
@@ -207,10 +223,11 @@ class BidirectionalSearch:
         self.opposite_search = SearchProcess(problem,
                                              problem.goal,
                                              opposite_heuristic)
+        self.tree = BidirectionalSearchTreeProxy(self.primary_search.tree, self.opposite_search.tree)
 
     @property
     def search_tree(self):
-        return BidirectionalSearchTreeProxy(self.primary_search.tree, self.opposite_search.tree)
+        return self.tree
 
     def solve(self):
         """
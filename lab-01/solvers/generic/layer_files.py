@@ -0,0 +1,101 @@
+import heapq
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+""" number of records read or written at once """
+BLOCK_RECORDS = 4096
+
+
+class SortedRecordFile:
+    """
+    Binary file of sorted, unique records of the same width, written once.
+    It can be read sequentially or searched with the binary search (records can be read at any offset).
+
+    Attributes:
+    ===========
+    path: Path
+        location of the file
+    record_size: int
+        number of bytes of every record
+    size: int
+        number of the records written
+    """
+
+    def __init__(self, path: Path, record_size: int):
+        self.path = path
+        self.record_size = record_size
+        self.size = 0
+
+    def write(self, records: Iterable[bytes]) -> None:
+        """ writes the records, which have to be sorted and unique already """
+        self.size = 0
+        with open(self.path, 'wb') as file:
+            block: list[bytes] = []
+            for record in records:
+                block.append(record)
+                if len(block) == BLOCK_RECORDS:
+                    file.write(b''.join(block))
+                    self.size += len(block)
+                    block.clear()
+            file.write(b''.join(block))
+            self.size += len(block)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[bytes]:
+        record_size = self.record_size
+        with open(self.path, 'rb') as file:
+            while block := file.read(BLOCK_RECORDS * record_size):
+                for start in range(0, len(block), record_size):
+                    yield block[start:start + record_size]
+
+    def __contains__(self, record: bytes) -> bool:
+        record_size = self.record_size
+        low, high = 0, self.size
+        with open(self.path, 'rb') as file:
+            while low < high:
+                middle = (low + high) // 2
+                file.seek(middle * record_size)
+                found = file.read(record_size)
+                if found == record:
+                    return True
+                if found < record:
+                    low = middle + 1
+                else:
+                    high = middle
+        return False
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def merge_unique(runs: Iterable[Iterable[bytes]]) -> Iterator[bytes]:
+    """
+    merges the sorted runs into a single sorted sequence without repetitions
+
+    >>> list(merge_unique([[b'a', b'c'], [b'a', b'b', b'd'], []]))
+    [b'a', b'b', b'c', b'd']
+    """
+    previous = None
+    for record in heapq.merge(*runs):
+        if record != previous:
+            yield record
+            previous = record
+
+
+def difference(records: Iterable[bytes], excluded: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    records of the first sorted sequence missing in the second one, both are read only once
+
+    >>> list(difference([b'a', b'b', b'c', b'e'], [b'b', b'd', b'e', b'f']))
+    [b'a', b'c']
+    """
+    excluded = iter(excluded)
+    current = next(excluded, None)
+    for record in records:
+        while current is not None and current < record:
+            current = next(excluded, None)
+        if current != record:
+            yield record
@@ -1,11 +1,17 @@
 from base.solver import P
 from solvers.utils import Queue
 from tree import Node, Tree
+from tree.node_store import NodeStore
+from tree.tree import NodeEvent
 
 
 class UninformedSearch:
     """
-    Type of search, that have access only to problem definition.    
+    Type of search, that have access only to problem definition.
+
+    Same as the :class:`BestFirstSearch` it keeps the generated nodes in a :class:`NodeStore`,
+    the queue holds only their indices.
+    If the tree has a profile enabled, the visited states lookups and the queue operations are timed.
     """
 
     def __init__(self, problem: P, queue: Queue):
@@ -13,25 +19,45 @@ class UninformedSearch:
         self.start = problem.initial
         self.frontier = queue
         self.visited = {self.start}
-        # using a set instead of a dictionary as it was in BestFirstSearch, 
+        # using a set instead of a dictionary as it was in BestFirstSearch,
         # because we don't have an evaluation funtion and there is no need for a dictionary.
         self.root = Node(self.start)
+        self.store: NodeStore = NodeStore(self.start, self.root.cost)
         self.tree = Tree(self.root)
 
     def solve(self):
         if self.problem.is_goal(self.start):
             return self.root
-        self.frontier.push(self.root)
+        problem, store, tree, visited = self.problem, self.store, self.tree, self.visited
+        states = store.states
+        seen, record = visited.__contains__, visited.add
+        push, pop = self.frontier.push, self.frontier.pop
+        profile = tree.profile
+        if profile is not None:
+            seen, record = profile.timed('visited', seen), profile.timed('visited', record)
+            push, pop = profile.timed('queue', push), profile.timed('queue', pop)
+        push(0)
 
         while not self.frontier.is_empty():
-            node = self.frontier.pop()
-
-            if self.problem.is_goal(node.state):
-                return node
-            
-            for child in self.tree.expand(self.problem, node):
-                if child.state not in self.visited:
-                    self.visited.add(child.state)
-                    self.frontier.push(child)
-                    
-        return None
\ No newline at end of file
+            index = pop()
+            state = states[index]
+
+            if problem.is_goal(state):
+                return store.node(index)
+
+            monitored = tree.dispatching
+            if monitored:
+                tree._notify_lazy(lambda: store.node(index), NodeEvent.Closed)
+            cost = store.costs[index]
+            for action in problem.actions(state):
+                child = problem.take_action(state, action)
+                child_cost = cost + problem.action_cost(state, action)
+                if monitored:
+                    tree._notify_lazy(lambda: Node(child, store.node(index), action, child_cost), NodeEvent.Opened)
+                if not seen(child):
+                    record(child)
+                    push(store.add(child, index, action, child_cost))
+            if profile is not None:
+                profile.frontier_size(len(self.frontier))
+
+        return None
@@ -8,7 +8,7 @@ from tree.tree import Tree
 class Greedy(HeuristicSolver):
     def __init__(self, problem, heuristic):
         super().__init__(problem, heuristic)
-        self.search = BestFirstSearch(problem, lambda node: heuristic(node.state))
+        self.search = BestFirstSearch(problem, heuristic, lambda h, cost: h)
 
     def solve(self) -> Node | None:
         return self.search.solve()
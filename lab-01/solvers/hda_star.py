@@ -0,0 +1,312 @@
+import heapq
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+import zlib
+from itertools import count
+from typing import Any, Hashable, cast
+
+from base.heuristic import Heuristic
+from base.problem import EncodableProblem, Problem
+from base.solver import HeuristicSolver
+from tree.node import Node
+from tree.tree import Tree
+
+
+""" number of the generated nodes sent to another worker at once """
+BATCH_SIZE = 64
+""" number of expansions after which a worker sends all its pending batches, even the incomplete ones """
+FLUSH_EVERY = 256
+""" how often (in seconds) the solver checks whether the search is over """
+POLL_INTERVAL = 0.005
+""" how long (in seconds) the solver waits for a worker to answer its question about the solution path """
+REPLY_TIMEOUT = 10.0
+
+
+class HDAStar(HeuristicSolver):
+    """
+    Hash-distributed A*: the state space is split by the state hash between the `workers` processes,
+    each one has its own open and closed lists (the best known path costs) of the states it owns.
+    A worker expands its best node and hands every child over to the child's owner,
+    the children owned by the other workers are sent in batches through their queues
+    and the heuristic of a received batch is evaluated by a single :meth:`Heuristic.batch` call.
+
+    If the problem is an :class:`EncodableProblem` the states travel in their binary encoding,
+    which is compact and hashed the same way in every process. Otherwise, they are sent as they are
+    and routed by the built-in hash, which is consistent, because the workers are forked (Unix only)
+    — that's also how they share the problem and the heuristic without pickling them.
+
+    The incumbent (the cheapest goal expanded so far) is shared. A worker is idle if none of its open nodes
+    has f lower than the incumbent cost. The search is over when all the workers are idle and every batch sent
+    has been received, twice in a row with no batch sent in between. Only a received batch can make an idle worker
+    busy again, so no node with f lower than the incumbent cost is left and, for an admissible heuristic,
+    the incumbent is optimal.
+    The solution path is recovered by asking the owners of its states for their parents, one by one.
+    Tree events aren't dispatched from the workers, only the tree stats (if enabled) are updated.
+    A worker failing (e.g. its heuristic raising an error or running out of memory) fails the whole search,
+    its error is raised by :meth:`solve`.
+
+    A daemonic process (e.g. a job of the portfolio benchmark) isn't allowed to have children,
+    so the solver running in one falls back to a single worker in a thread of its own process.
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, workers: int | None = None):
+        super().__init__(problem, heuristic)
+        self.workers = workers or os.cpu_count() or 1
+        self.root = Node(problem.initial)
+        self.tree = Tree(self.root)
+
+    def solve(self) -> Node | None:
+        if self.problem.is_goal(self.root.state):
+            return self.root
+
+        context = multiprocessing.get_context("fork")
+        in_process = multiprocessing.current_process().daemon
+        n_workers = 1 if in_process else self.workers
+        shared = _SharedSearch(context, n_workers)
+        workers = [_Worker(self.problem, self.heuristic, index, shared) for index in range(n_workers)]
+        processes: list[Any] = [threading.Thread(target=worker.run, daemon=True) if in_process
+                                else context.Process(target=worker.run, daemon=True) for worker in workers]
+        for process in processes:
+            process.start()
+        try:
+            root = workers[0].key(self.problem.initial)
+            shared.send(workers[0].owner(root), [(root, 0, None, None)])
+            self._wait_until_finished(shared, processes)
+            shared.stop.set()
+            return self._trace_back(shared, workers[0])
+        finally:
+            shared.stop.set()
+            for index in range(n_workers):
+                shared.requests[index].put(None)
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive() and not in_process:
+                    process.terminate()
+
+    def search_tree(self) -> Tree:
+        return self.tree
+
+    def _wait_until_finished(self, shared: '_SharedSearch', processes: list[Any]) -> None:
+        previous_sent = None
+        while True:
+            time.sleep(POLL_INTERVAL)
+            self._check_workers(shared, processes)
+            self._update_stats(shared)
+            sent = shared.sent.value
+            if all(shared.idle) and sent == shared.received.value:
+                if sent == previous_sent:
+                    return
+                previous_sent = sent
+            else:
+                previous_sent = None
+
+    def _check_workers(self, shared: '_SharedSearch', processes: list[Any]) -> None:
+        """ raises the error of a failed worker, the failed one would never become idle """
+        try:
+            index, trace, out_of_memory = shared.errors.get_nowait()
+        except queue.Empty:
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    raise Exception(f"HDA* worker {index} has died")
+            return
+        if out_of_memory:
+            raise MemoryError(f"HDA* worker {index} ran out of memory")
+        raise Exception(f"HDA* worker {index} failed:\n{trace}")
+
+    def _update_stats(self, shared: '_SharedSearch') -> None:
+        stats = self.tree.stats
+        if stats is not None:
+            stats.closed = sum(shared.expanded)
+            stats.opened = sum(shared.generated)
+
+    def _trace_back(self, shared: '_SharedSearch', router: '_Worker') -> Node | None:
+        """ asks the owners for the parents of the states on the solution path, starting from the goal """
+        if shared.incumbent.value == float('inf'):
+            return None
+        shared.requests[shared.incumbent_owner.value].put(_GOAL)
+        key = shared.reply()
+        steps = []
+        while True:
+            shared.requests[router.owner(key)].put(key)
+            parent, action = shared.reply()
+            if parent is None:
+                break
+            steps.append((action, key))
+            key = parent
+
+        node = self.root
+        for action, key in reversed(steps):
+            state = router.state(key)
+            node = Node(state, node, action, node.cost + self.problem.action_cost(node.state, action))
+        return node
+
+
+""" request for the key of the goal found by the worker """
+_GOAL = "goal"
+
+
+class _SharedSearch:
+    """ queues and counters shared by the solver and its workers """
+
+    def __init__(self, context: Any, workers: int):
+        self.inboxes = [context.Queue() for _ in range(workers)]
+        self.requests = [context.Queue() for _ in range(workers)]
+        self.replies = context.Queue()
+        self.errors = context.Queue()
+        self.idle = context.RawArray('b', workers)
+        self.expanded = context.RawArray('q', workers)
+        self.generated = context.RawArray('q', workers)
+        self.sent = context.Value('q', 0)
+        self.received = context.Value('q', 0)
+        self.incumbent = context.Value('d', float('inf'))
+        self.incumbent_owner = context.Value('i', -1)
+        self.stop = context.Event()
+
+    def send(self, owner: int, batch: list) -> None:
+        # counted before it's sent, so it's never received uncounted
+        with self.sent.get_lock():
+            self.sent.value += 1
+        self.inboxes[owner].put(batch)
+
+    def reply(self) -> Any:
+        try:
+            return self.replies.get(timeout=REPLY_TIMEOUT)
+        except queue.Empty:
+            raise Exception(f"HDA* worker hasn't answered in {REPLY_TIMEOUT}s") from None
+
+
+class _Worker:
+    """ the part of the HDA* search running in a single worker process """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, index: int, shared: _SharedSearch):
+        self.problem = problem
+        self.heuristic = heuristic
+        self.index = index
+        self.shared = shared
+        self.n_workers = len(shared.inboxes)
+        self.encodable = problem if isinstance(problem, EncodableProblem) else None
+
+    def key(self, state: Any) -> Hashable:
+        return self.encodable.encode(state) if self.encodable is not None else state
+
+    def state(self, key: Hashable) -> Any:
+        return self.encodable.decode(cast(bytes, key)) if self.encodable is not None else key
+
+    def owner(self, key: Hashable) -> int:
+        return (zlib.crc32(cast(bytes, key)) if self.encodable is not None else hash(key)) % self.n_workers
+
+    def run(self) -> None:
+        self.best: dict[Hashable, float] = {}
+        self.parents: dict[Hashable, tuple[Hashable | None, Any]] = {}
+        self.open: list[tuple[float, float, int, Hashable, Any]] = []
+        self.counter = count()
+        self.outbox: list[list] = [[] for _ in range(self.n_workers)]
+        self.goal: Hashable | None = None
+        try:
+            self._search()
+        except BaseException as e:
+            self.shared.errors.put((self.index, traceback.format_exc(), isinstance(e, MemoryError)))
+        finally:
+            self._serve_requests()
+
+    def _search(self) -> None:
+        problem, shared, index = self.problem, self.shared, self.index
+        incumbent = shared.incumbent.get_obj()
+        expansions = 0
+        while not shared.stop.is_set():
+            self._receive(block=False)
+            if not self.open or self.open[0][0] >= incumbent.value:
+                self._flush()
+                shared.idle[index] = 1
+                self._receive(block=True)
+                continue
+
+            _, negative_cost, _, key, state = heapq.heappop(self.open)
+            g = self.best[key]
+            if -negative_cost != g:
+                # a cheaper path to the state has been queued since
+                continue
+            if problem.is_goal(state):
+                self._update_incumbent(key, g)
+                continue
+            shared.expanded[index] += 1
+            for action in problem.actions(state):
+                child = problem.take_action(state, action)
+                child_key = self.key(child)
+                child_cost = g + problem.action_cost(state, action)
+                shared.generated[index] += 1
+                owner = self.owner(child_key)
+                if owner == index:
+                    self._add(child_key, child_cost, key, action, child)
+                else:
+                    self.outbox[owner].append((child_key, child_cost, key, action))
+                    if len(self.outbox[owner]) >= BATCH_SIZE:
+                        shared.send(owner, self.outbox[owner])
+                        self.outbox[owner] = []
+            expansions += 1
+            if expansions % FLUSH_EVERY == 0:
+                self._flush()
+        # the batches left unread mustn't keep the worker from exiting
+        for inbox in shared.inboxes:
+            inbox.cancel_join_thread()
+
+    def _add(self, key: Hashable, cost: float, parent: Hashable | None, action: Any, state: Any) -> None:
+        known = self.best.get(key)
+        if known is not None and known <= cost:
+            return
+        self.best[key] = cost
+        self.parents[key] = (parent, action)
+        heapq.heappush(self.open, (cost + self.heuristic(state), -cost, next(self.counter), key, state))
+
+    def _add_batch(self, batch: list) -> None:
+        """ adds the received nodes improving the best known costs, their heuristic is evaluated at once """
+        best, parents = self.best, self.parents
+        improved = []
+        for key, cost, parent, action in batch:
+            known = best.get(key)
+            if known is None or cost < known:
+                best[key] = cost
+                parents[key] = (parent, action)
+                improved.append((key, cost))
+        states = [self.state(key) for key, _ in improved]
+        for (key, cost), state, h in zip(improved, states, self.heuristic.batch(states)):
+            heapq.heappush(self.open, (cost + h, -cost, next(self.counter), key, state))
+
+    def _receive(self, block: bool) -> None:
+        """ adds the received batches to the open list, waits a while for one, if `block` is set """
+        shared, index = self.shared, self.index
+        inbox = shared.inboxes[index]
+        while True:
+            try:
+                batch = inbox.get(timeout=POLL_INTERVAL) if block else inbox.get_nowait()
+            except queue.Empty:
+                return
+            shared.idle[index] = 0
+            self._add_batch(batch)
+            with shared.received.get_lock():
+                shared.received.value += 1
+            block = False
+
+    def _flush(self) -> None:
+        for owner, batch in enumerate(self.outbox):
+            if batch:
+                self.shared.send(owner, batch)
+                self.outbox[owner] = []
+
+    def _update_incumbent(self, key: Hashable, cost: float) -> None:
+        shared = self.shared
+        with shared.incumbent.get_lock():
+            if cost < shared.incumbent.value:
+                shared.incumbent.value = cost
+                shared.incumbent_owner.value = self.index
+                self.goal = key
+
+    def _serve_requests(self) -> None:
+        """ answers the solver's questions about the goal and the parents until it says it's done """
+        requests, replies = self.shared.requests[self.index], self.shared.replies
+        while (request := requests.get()) is not None:
+            replies.put(self.goal if request == _GOAL else self.parents.get(request, (None, None)))
@@ -0,0 +1,97 @@
+from base.heuristic import Heuristic
+from base.problem import Problem
+from base.solver import HeuristicSolver
+from base.state import State
+from tree.tree import NodeEvent, Tree
+from tree.node import Node
+
+
+class IDAStar(HeuristicSolver):
+    """
+    Iterative deepening A*.
+
+    Runs a series of depth-first searches bounded by the f = g + h value,
+    each time raising the bound to the smallest f that exceeded it.
+    Only the current path is kept in memory (states, costs and pending actions),
+    so the memory usage is linear in the solution depth.
+    Nodes are created for the solution path and, if anybody listens, for the tree events.
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic):
+        super().__init__(problem, heuristic)
+        self.root = Node(problem.initial)
+        self.tree = Tree(self.root)
+
+    def solve(self) -> Node | None:
+        if self.problem.is_goal(self.root.state):
+            return self.root
+
+        bound = self.heuristic(self.root.state)
+        while bound != float('inf'):
+            solution, bound = self._bounded_search(bound)
+            if solution is not None:
+                return solution
+        return None
+
+    def search_tree(self) -> Tree:
+        return self.tree
+
+    def _bounded_search(self, bound: float) -> tuple[Node | None, float]:
+        """
+        depth-first search pruning nodes with f > bound
+        returns the solution (if found) and the bound for the next iteration
+        """
+        problem = self.problem
+        heuristic = self.heuristic
+        monitored = self.tree.dispatching
+
+        next_bound = float('inf')
+        states: list[State] = [self.root.state]
+        costs: list[float] = [0]
+        actions: list[object] = []
+        pending = [iter(problem.actions(self.root.state))]
+        on_path = {self.root.state}
+        if monitored:
+            self.tree._notify(self.root, NodeEvent.Closed)
+
+        while pending:
+            action = next(pending[-1], None)
+            if action is None:
+                pending.pop()
+                on_path.discard(states.pop())
+                costs.pop()
+                if actions:
+                    actions.pop()
+                continue
+
+            state = states[-1]
+            child = problem.take_action(state, action)
+            if child in on_path:
+                continue
+            cost = costs[-1] + problem.action_cost(state, action)
+            if monitored:
+                self.tree._notify_lazy(lambda: Node(child, action=action, cost=cost), NodeEvent.Opened)
+
+            estimate = cost + heuristic(child)
+            if estimate > bound:
+                next_bound = min(next_bound, estimate)
+                continue
+
+            states.append(child)
+            costs.append(cost)
+            actions.append(action)
+            if problem.is_goal(child):
+                return self._build_path(states, costs, actions), bound
+
+            on_path.add(child)
+            pending.append(iter(problem.actions(child)))
+            if monitored:
+                self.tree._notify_lazy(lambda: Node(child, action=action, cost=cost), NodeEvent.Closed)
+
+        return None, next_bound
+
+    def _build_path(self, states: list[State], costs: list[float], actions: list[object]) -> Node:
+        node = self.root
+        for state, cost, action in zip(states[1:], costs[1:], actions):
+            node = Node(state, parent=node, action=action, cost=cost)
+        return node
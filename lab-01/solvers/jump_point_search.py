@@ -0,0 +1,152 @@
+from typing import cast
+from base.heuristic import Heuristic
+from base.solver import HeuristicSolver
+from problems.grid_pathfinding.grid import GridCoord
+from problems.grid_pathfinding.grid_move import GridMove
+from problems.grid_pathfinding.grid_pathfinding import GridPathfinding
+from solvers.utils import IndexedPriorityQueue
+from tree.tree import NodeEvent, Tree
+from tree.node import Node
+
+
+class JPS(HeuristicSolver):
+    """
+    Jump Point Search, A* specialized for the :class:`GridPathfinding`.
+
+    Instead of expanding every neighbour, the search moves in a straight line (a jump)
+    until it reaches the goal or a cell with a forced neighbour, i.e. a jump point,
+    so the symmetric paths are never generated and only the jump points get expanded.
+    Diagonal moves follow the same rules as the problem: they are forbidden if `diagonal_weight` <= 0
+    and can't cut corners (see :meth:`GridMove.involved_moves`).
+
+    The pruning rules are valid when the diagonal move costs between 1 and 2.
+    If it costs 2 or more, two straight moves are never worse, so the 4-connected rules are used;
+    if it costs less than 1, zig-zag paths may be optimal and every legal move is generated instead (plain A*).
+    The returned solution is unfolded into single moves, just like the one from :class:`AStar`.
+    """
+
+    def __init__(self, problem: GridPathfinding, heuristic: Heuristic):
+        super().__init__(problem, heuristic)
+        self.root = Node(problem.initial)
+        self.tree = Tree(self.root)
+        self.free = (~problem.grid.walls).tolist()
+        weight = problem.diagonal_weight
+        self.diagonal = 0 < weight < 2
+        self.prune = not 0 < weight < 1
+
+    def solve(self) -> Node | None:
+        if self.problem.is_goal(self.root.state):
+            return self.root
+
+        heuristic = self.heuristic
+        frontier: IndexedPriorityQueue[Node] = IndexedPriorityQueue(
+            key=lambda node: (node.cost + heuristic(node.state), -node.cost),
+            address=lambda node: node.state)
+        visited = {self.root.state: 0.0}
+        frontier.push(self.root)
+
+        while not frontier.is_empty():
+            node = frontier.pop()
+            if self.problem.is_goal(node.state):
+                return self._unfold(node)
+
+            monitored = self.tree.dispatching
+            if monitored:
+                self.tree._notify(node, NodeEvent.Closed)
+            for child in self._successors(node):
+                if monitored:
+                    self.tree._notify(child, NodeEvent.Opened)
+                if child.cost < visited.get(child.state, float('inf')):
+                    visited[child.state] = child.cost
+                    frontier.push(child)
+        return None
+
+    def search_tree(self) -> Tree:
+        return self.tree
+
+    def _successors(self, node: Node) -> list[Node]:
+        state = node.state
+        if not self.prune:
+            return [Node(self.problem.take_action(state, move), parent=node, action=move,
+                         cost=node.cost + self.problem.action_cost(state, move))
+                    for move in self.problem.actions(state)]
+
+        children = []
+        for dx, dy in self._directions(node):
+            jump_point = self._jump(state.x, state.y, dx, dy)
+            if jump_point is None:
+                continue
+            x, y = jump_point
+            steps = max(abs(x - state.x), abs(y - state.y))
+            step_cost = self.problem.diagonal_weight if dx and dy else 1.0
+            children.append(Node(GridCoord(x, y), parent=node, action=GridMove.from_value((dy, dx)),
+                                 cost=node.cost + steps * step_cost))
+        return children
+
+    def _directions(self, node: Node) -> list[tuple[int, int]]:
+        """ returns directions (dx, dy) worth a jump, pruning the ones covered by the parent """
+        x, y = node.state.x, node.state.y
+        free = self._free
+        if node.parent is None:
+            directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+            if self.diagonal:
+                directions += [(-1, -1), (1, -1), (-1, 1), (1, 1)]
+            return directions
+
+        dx = _sign(x - node.parent.state.x)
+        dy = _sign(y - node.parent.state.y)
+        if dx and dy:
+            return [(0, dy), (dx, 0), (dx, dy)]
+        if not self.diagonal:
+            return [(dx, dy), (dy, dx), (-dy, -dx)]
+        if dx:
+            directions = [(dx, 0), (0, -1), (0, 1)]
+            if free(x + dx, y):
+                directions += [(dx, -1), (dx, 1)]
+            return directions
+        directions = [(0, dy), (-1, 0), (1, 0)]
+        if free(x, y + dy):
+            directions += [(-1, dy), (1, dy)]
+        return directions
+
+    def _jump(self, x: int, y: int, dx: int, dy: int) -> tuple[int, int] | None:
+        """ moves from (x, y) in the given direction until a jump point, returns None at a dead end """
+        free = self._free
+        goal = self.problem.goal
+        while True:
+            if dx and dy and not (free(x + dx, y) and free(x, y + dy)):
+                return None
+            x += dx
+            y += dy
+            if not free(x, y):
+                return None
+            if x == goal.x and y == goal.y:
+                return x, y
+            if dx and dy:
+                if self._jump(x, y, dx, 0) is not None or self._jump(x, y, 0, dy) is not None:
+                    return x, y
+            elif dx:
+                if (free(x, y - 1) and not free(x - dx, y - 1)) or (free(x, y + 1) and not free(x - dx, y + 1)):
+                    return x, y
+            else:
+                if (free(x - 1, y) and not free(x - 1, y - dy)) or (free(x + 1, y) and not free(x + 1, y - dy)):
+                    return x, y
+                if not self.diagonal and (self._jump(x, y, -1, 0) is not None or self._jump(x, y, 1, 0) is not None):
+                    return x, y
+
+    def _free(self, x: int, y: int) -> bool:
+        return 0 <= y < len(self.free) and 0 <= x < len(self.free[y]) and self.free[y][x]
+
+    def _unfold(self, goal: Node) -> Node:
+        """ replaces jumps in the solution path with the single moves """
+        node = self.root
+        for jump_point in goal.path()[1:]:
+            move = cast(GridMove, jump_point.action)
+            step_cost = self.problem.action_cost(node.state, move)
+            while node.state != jump_point.state:
+                node = Node(node.state + move.value, parent=node, action=move, cost=node.cost + step_cost)
+        return node
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
@@ -0,0 +1,41 @@
+from base.solver import Solver
+from problems.rush_hour.distance_database import UNREACHED, RushHourDistanceDatabase
+from problems.rush_hour.rush_hour import RushHourProblem
+from tree.node import Node
+from tree.tree import Tree
+
+
+class RushHourLookup(Solver):
+    """
+    Solves Rush Hour with the retrograde distance database, no search involved:
+    at each board it takes the first move that decreases the stored distance to the goal.
+    Building the database is a one-time cost per puzzle layout, paid in the constructor.
+    A database that doesn't match the puzzle (no move decreases the distance, or the walk doesn't end in the goal)
+    is reported by an exception rather than by a wrong solution.
+    """
+
+    def __init__(self, problem: RushHourProblem):
+        super().__init__(problem)
+        self.database = RushHourDistanceDatabase.load_or_build(problem)
+        self.root = Node(problem.initial)
+        self.tree = Tree(self.root)
+
+    def solve(self) -> Node | None:
+        node = self.root
+        distance = self.database.distance(node.state)
+        if distance is None or distance == UNREACHED:
+            return None
+        while distance > 0:
+            for child in self.tree.expand(self.problem, node):
+                if self.database.distance(child.state) == distance - 1:
+                    node = child
+                    break
+            else:
+                raise Exception(f"Stale distance database: no move decreases the distance {distance}")
+            distance -= 1
+        if not self.problem.is_goal(node.state):
+            raise Exception("Stale distance database: distance 0 at a board that isn't the goal")
+        return node
+
+    def search_tree(self) -> Tree:
+        return self.tree
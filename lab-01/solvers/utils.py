@@ -2,8 +2,9 @@ from abc import ABC, abstractmethod
 from collections import deque
 from dataclasses import dataclass
 import heapq
+import math
 from dataclasses import dataclass, field
-from typing import Any, Callable, Deque, Generic, TypeVar
+from typing import Any, Callable, Deque, Generic, Hashable, TypeVar
 
 
 TItem = TypeVar('TItem')
@@ -22,6 +23,10 @@ class Queue(ABC, Generic[TItem]):
     def is_empty(self) -> bool:
         pass
 
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
 
 class FIFO(Queue[TItem]):
     """
@@ -51,6 +56,9 @@ class FIFO(Queue[TItem]):
     def is_empty(self) -> bool:
         return len(self.queue) == 0
 
+    def __len__(self) -> int:
+        return len(self.queue)
+
 
 class LIFO(Queue[TItem]):
     """
@@ -80,6 +88,9 @@ class LIFO(Queue[TItem]):
     def is_empty(self) -> bool:
         return len(self.queue) == 0
 
+    def __len__(self) -> int:
+        return len(self.queue)
+
 
 @dataclass(order=True)
 class PQItem(Generic[TItem]):
@@ -124,3 +135,223 @@ class PriorityQueue(Generic[TItem]):
 
     def __bool__(self):
         return not self.is_empty()
+
+
+class IndexedPriorityQueue(Generic[TItem]):
+    """
+    Addressable binary heap: every item has an address (e.g. its state)
+    and the queue keeps at most one item per address.
+
+    Pushing an item with an address that's already queued works as decrease-key:
+    the queued item is replaced only if the new one has a smaller `key`,
+    otherwise the push is rejected. Thanks to that, the heap never holds stale duplicates.
+
+    Example:
+
+    >>> a = IndexedPriorityQueue(key=lambda x: x[1], address=lambda x: x[0])
+    >>> a.push(('a', 3))
+    True
+    >>> a.push(('b', 2))
+    True
+    >>> a.push(('a', 1)) # decrease key
+    True
+    >>> a.push(('b', 5)) # rejected, 'b' is already queued with a smaller key
+    False
+    >>> a.pop()
+    ('a', 1)
+    >>> a.pop()
+    ('b', 2)
+    """
+
+    def __init__(self, key: Callable[[TItem], Any], address: Callable[[TItem], Hashable]):
+        self.key = key
+        self.address = address
+        self.heap: list[tuple[Any, TItem]] = []
+        self.positions: dict[Hashable, int] = {}
+
+    def push(self, x: TItem) -> bool:
+        """ inserts the item or decreases key of the queued one, returns False if nothing changed """
+        address = self.address(x)
+        entry = (self.key(x), x)
+        position = self.positions.get(address)
+        if position is None:
+            self.heap.append(entry)
+            self.positions[address] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return True
+        if entry[0] < self.heap[position][0]:
+            self.heap[position] = entry
+            self._sift_up(position)
+            return True
+        return False
+
+    def replace(self, x: TItem) -> None:
+        """ inserts the item or replaces the queued one, no matter how the key has changed """
+        position = self.positions.get(self.address(x))
+        if position is None:
+            self.push(x)
+            return
+        self.heap[position] = (self.key(x), x)
+        self._sift_up(position)
+        self._sift_down(self.positions[self.address(x)])
+
+    def pop(self) -> TItem:
+        heap = self.heap
+        _, item = heap[0]
+        del self.positions[self.address(item)]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.positions[self.address(last[1])] = 0
+            self._sift_down(0)
+        return item
+
+    def items(self) -> list[TItem]:
+        """ returns all the queued items """
+        return [item for _, item in self.heap]
+
+    def is_empty(self) -> bool:
+        return len(self.heap) == 0
+
+    def __contains__(self, address: Hashable) -> bool:
+        return address in self.positions
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __bool__(self):
+        return not self.is_empty()
+
+    def _sift_up(self, position: int) -> None:
+        heap, positions, address = self.heap, self.positions, self.address
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[position] = heap[parent]
+            positions[address(heap[position][1])] = position
+            position = parent
+        heap[position] = entry
+        positions[address(entry[1])] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap, positions, address = self.heap, self.positions, self.address
+        entry = heap[position]
+        size = len(heap)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[position] = heap[child]
+            positions[address(heap[position][1])] = position
+            position = child
+        heap[position] = entry
+        positions[address(entry[1])] = position
+
+
+class NonIntegralKeyError(ValueError):
+    """ raised by the :class:`BucketPriorityQueue` when a key is not a non-negative integer """
+
+
+class BucketPriorityQueue(Generic[TItem]):
+    """
+    Addressable priority queue for non-negative integer keys.
+
+    Items are kept in buckets indexed by their key, the smallest non-empty bucket
+    is tracked with a pointer, so both push and pop work in O(1) amortized time.
+    Items with the same key are popped in the Last In First Out order.
+    Same as in :class:`IndexedPriorityQueue` there is at most one live item per address,
+    updated items are left in their old buckets and skipped as stale when reached.
+
+    Example:
+
+    >>> a = BucketPriorityQueue(key=lambda x: x[1], address=lambda x: x[0])
+    >>> a.push(('a', 3))
+    True
+    >>> a.push(('b', 1))
+    True
+    >>> a.push(('c', 1))
+    True
+    >>> a.push(('a', 0)) # decrease key
+    True
+    >>> [a.pop() for _ in range(3)]
+    [('a', 0), ('c', 1), ('b', 1)]
+    >>> a.push(('d', 0.5)) # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    solvers.utils.NonIntegralKeyError: 0.5
+    >>> a.push(('e', float('inf'))) # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    solvers.utils.NonIntegralKeyError: inf
+    """
+
+    def __init__(self, key: Callable[[TItem], float], address: Callable[[TItem], Hashable]):
+        self.key = key
+        self.address = address
+        self.buckets: list[list[TItem]] = []
+        self.entries: dict[Hashable, tuple[int, TItem]] = {}
+        self.min_key = 0
+
+    def push(self, x: TItem) -> bool:
+        """ inserts the item or decreases key of the queued one, returns False if nothing changed """
+        key = self._bucket_key(x)
+        queued = self.entries.get(self.address(x))
+        if queued is not None and queued[0] <= key:
+            return False
+        self._insert(x, key)
+        return True
+
+    def replace(self, x: TItem) -> None:
+        """ inserts the item or replaces the queued one, no matter how the key has changed """
+        self._insert(x, self._bucket_key(x))
+
+    def pop(self) -> TItem:
+        entries, address = self.entries, self.address
+        while True:
+            bucket = self.buckets[self.min_key]
+            while bucket:
+                item = bucket.pop()
+                queued = entries.get(address(item))
+                if queued is not None and queued[1] is item:
+                    del entries[address(item)]
+                    return item
+            self.min_key += 1
+
+    def items(self) -> list[TItem]:
+        """ returns all the live items """
+        return [item for _, item in self.entries.values()]
+
+    def is_empty(self) -> bool:
+        return len(self.entries) == 0
+
+    def __contains__(self, address: Hashable) -> bool:
+        return address in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __bool__(self):
+        return not self.is_empty()
+
+    def _bucket_key(self, x: TItem) -> int:
+        key = self.key(x)
+        if not math.isfinite(key):
+            raise NonIntegralKeyError(key)
+        bucket_key = int(key)
+        if bucket_key != key or bucket_key < 0:
+            raise NonIntegralKeyError(key)
+        return bucket_key
+
+    def _insert(self, x: TItem, key: int) -> None:
+        while len(self.buckets) <= key:
+            self.buckets.append([])
+        self.buckets[key].append(x)
+        self.entries[self.address(x)] = (key, x)
+        if key < self.min_key or len(self.entries) == 1:
+            self.min_key = key
@@ -0,0 +1,31 @@
+from base.heuristic import Heuristic
+from base.problem import Problem
+from base.solver import HeuristicSolver
+from solvers.generic.best_first import BestFirstSearch
+from tree.tree import Tree
+from tree.node import Node
+
+
+DEFAULT_WEIGHT = 2.0
+
+
+class WeightedAStar(HeuristicSolver):
+    """
+    A* with the heuristic inflated by the `weight` (f = g + weight * h).
+    It usually expands far fewer nodes than A* and, for an admissible heuristic,
+    the solution costs at most `weight` times as much as the optimal one.
+    Same as :class:`AStar` it may evaluate an expensive `lazy_heuristic` only for the nodes about to be expanded.
+    """
+
+    def __init__(self, problem: Problem, heuristic: Heuristic, weight: float = DEFAULT_WEIGHT,
+                 lazy_heuristic: Heuristic | None = None):
+        super().__init__(problem, heuristic)
+        self.weight = weight
+        self.lazy_heuristic = lazy_heuristic
+        self.search = BestFirstSearch(problem, heuristic, lambda h, cost: cost + weight * h, lazy_heuristic)
+
+    def solve(self) -> Node | None:
+        return self.search.solve()
+
+    def search_tree(self) -> Tree:
+        return self.search.tree
@@ -57,11 +57,15 @@ class Node(Generic[S]):
         return reverse_order(self)
 
     def root(self):
-        if self.parent is None:
-            return self
-        return self.parent.root()
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
 
     def has_cycle(self) -> bool:
-        def find_cycle(ancestor):
-            return ancestor is not None and (ancestor.state == self.state or find_cycle(ancestor.parent))
-        return find_cycle(self.parent)
+        ancestor = self.parent
+        while ancestor is not None:
+            if ancestor.state == self.state:
+                return True
+            ancestor = ancestor.parent
+        return False
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from array import array
+from typing import Generic, TypeVar
+from base.state import State
+from tree.node import Node
+
+
+S = TypeVar("S", bound=State)
+NO_PARENT = -1
+
+
+class NodeStore(Generic[S]):
+    """
+    Arena of the search nodes kept in parallel arrays, a node is just its index.
+
+    Instead of a :class:`Node` object per generated child, the store keeps
+    the parent index, the action id and the path cost in the typed arrays
+    and the state in a plain list, so a node costs a few machine words on top of its state.
+    Actions are interned in the `action_table` by identity, so the problems reusing
+    the same action objects (e.g. enums or precomputed moves) store every action once.
+    The root is always the node 0. Use :meth:`node` to turn an index into a regular :class:`Node`.
+
+    Attributes:
+    ===========
+    states: list[S]
+        `states[i]` is the state of the i-th node
+    parents: array[int]
+        `parents[i]` is the index of the parent of the i-th node, `NO_PARENT` for the root
+    actions: array[int]
+        `actions[i]` is the id of the action leading to the i-th node, -1 for the root
+    costs: array[int] | array[float]
+        `costs[i]` is the path cost of the i-th node,
+        kept as integers until the first non-integer cost is stored
+    action_table: list[object]
+        `action_table[id]` is the action with the given id
+    nodes: dict[int, Node[S]]
+        the already built :class:`Node` objects
+    """
+
+    def __init__(self, root: S, cost: float = 0):
+        self.states: list[S] = [root]
+        self.parents = array('q', [NO_PARENT])
+        self.actions = array('l', [-1])
+        self.costs = array('q' if isinstance(cost, int) else 'd', [cost])
+        self.action_table: list[object] = []
+        self.action_ids: dict[int, int] = {}
+        self.nodes: dict[int, Node[S]] = {}
+
+    def add(self, state: S, parent: int, action: object, cost: float) -> int:
+        """ stores a new node, returns its index """
+        action_id = self.action_ids.get(id(action))
+        if action_id is None:
+            # the table keeps the action alive, so its id can't be reused by another object
+            action_id = self.action_ids[id(action)] = len(self.action_table)
+            self.action_table.append(action)
+        try:
+            self.costs.append(cost)
+        except TypeError:
+            self.costs = array('d', self.costs)
+            self.costs.append(cost)
+        self.parents.append(parent)
+        self.actions.append(action_id)
+        self.states.append(state)
+        return len(self.states) - 1
+
+    def path(self, index: int) -> list[int]:
+        """ returns indices of the nodes on the path from the root to the given node """
+        parents = self.parents
+        path = []
+        while index != NO_PARENT:
+            path.append(index)
+            index = parents[index]
+        return path[::-1]
+
+    def node(self, index: int) -> Node[S]:
+        """
+        returns the :class:`Node` of the given index along with all its ancestors,
+        nodes built once are cached, so the next paths are built only from the last cached ancestor
+        """
+        missing = []
+        node = None
+        while index != NO_PARENT:
+            node = self.nodes.get(index)
+            if node is not None:
+                break
+            missing.append(index)
+            index = self.parents[index]
+        for i in reversed(missing):
+            action_id = self.actions[i]
+            node = Node(self.states[i], parent=node,
+                        action=self.action_table[action_id] if action_id >= 0 else None,
+                        cost=self.costs[i])
+            self.nodes[i] = node
+        assert node is not None
+        return node
+
+    def __len__(self) -> int:
+        return len(self.states)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+import copy
+from time import perf_counter
+from typing import Any, Callable, Generic, Sequence, TypeVar
+from base.cached_heuristic import CachedHeuristic, cache_report
+from base.heuristic import Heuristic
+from base.problem import Problem
+from base.state import State
+from tree.node import Node
+from tree.tree import TreeStats
+
+
+S = TypeVar("S", bound=State)
+F = TypeVar("F", bound=Callable)
+
+""" problem methods timed by the profile """
+PROBLEM_PHASES = ('actions', 'take_action', 'action_cost', 'is_goal')
+""" all the phases, `visited` and `queue` are timed only by the solvers built on the generic searches """
+PHASES = PROBLEM_PHASES + ('heuristic', 'visited', 'queue')
+
+
+class SearchProfile:
+    """
+    Breakdown of the solving time into the search phases.
+
+    Every phase is timed by wrapping the callables the solver uses (see :meth:`timed`),
+    the time is exclusive: e.g. heuristic evaluated while pushing a node into the queue
+    counts only as the heuristic. The wrappers make the calls slower, so the shares
+    of the phases are more meaningful than the absolute times.
+    The time not spent in any phase (the search loop itself, creating nodes, events) is reported as `other`.
+
+    Attributes:
+    ===========
+    times: dict[str, float]
+        exclusive time spent in each phase (seconds)
+    calls: dict[str, int]
+        number of calls of each phase
+    reopened: int
+        closed states queued again, because a cheaper path was found
+    reinserted: int
+        nodes pushed back into the frontier, because the lazy heuristic raised their value
+    peak_frontier: int
+        the largest observed frontier size
+    stats: TreeStats | None
+        counters of the tree the profile is attached to
+    heuristic_caches: list[CachedHeuristic]
+        caches of the heuristics used by the solver, their hits and misses are reported together
+    """
+
+    def __init__(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.reopened = 0
+        self.reinserted = 0
+        self.peak_frontier = 0
+        self.stats: TreeStats | None = None
+        self.heuristic_caches: list[CachedHeuristic] = []
+        self._nested: list[float] = []
+
+    def timed(self, phase: str, fun: F) -> F:
+        """ returns the function wrapped so its calls are accounted to the given phase """
+        times, calls, nested = self.times, self.calls, self._nested
+
+        def timed_fun(*args):
+            nested.append(0.0)
+            start = perf_counter()
+            try:
+                return fun(*args)
+            finally:
+                elapsed = perf_counter() - start
+                times[phase] += elapsed - nested.pop()
+                calls[phase] += 1
+                if nested:
+                    nested[-1] += elapsed
+        return timed_fun  # type: ignore
+
+    def instrument(self, problem: Problem[S, Any]) -> Problem[S, Any]:
+        """ returns a shallow copy of the problem, whose methods used by the solvers are timed """
+        profiled = copy.copy(problem)
+        for phase in PROBLEM_PHASES:
+            setattr(profiled, phase, self.timed(phase, getattr(problem, phase)))
+        return profiled
+
+    def frontier_size(self, size: int) -> None:
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    def report(self, wall_time: float, solution: Node | None = None) -> dict[str, Any]:
+        """ summary of the search ready to be serialized to JSON """
+        expansions = self.stats.closed if self.stats is not None else 0
+        generated = self.stats.opened if self.stats is not None else 0
+        depth = len(solution.path()) - 1 if solution is not None else None
+        phases = {phase: {"time": self.times[phase], "calls": self.calls[phase],
+                          "share": self.times[phase] / wall_time if wall_time > 0 else 0.0}
+                  for phase in PHASES}
+        other = max(0.0, wall_time - sum(self.times.values()))
+        phases["other"] = {"time": other, "calls": 0, "share": other / wall_time if wall_time > 0 else 0.0}
+        return {
+            "wall_time": wall_time,
+            "expansions": expansions,
+            "generated": generated,
+            "expansions_per_second": expansions / wall_time if wall_time > 0 else None,
+            "mean_branching_factor": generated / expansions if expansions else None,
+            "effective_branching_factor": effective_branching_factor(generated, depth),
+            "solution_depth": depth,
+            "reopened": self.reopened,
+            "reinserted": self.reinserted,
+            "peak_frontier": self.peak_frontier,
+            "heuristic_cache": cache_report(self.heuristic_caches) if self.heuristic_caches else None,
+            "phases": phases,
+        }
+
+
+class ProfiledHeuristic(Heuristic[S], Generic[S]):
+    """ heuristic timed as the `heuristic` phase of the profile, otherwise works as the wrapped one """
+
+    def __init__(self, heuristic: Heuristic[S], profile: SearchProfile):
+        self.heuristic = heuristic
+        self.evaluate = profile.timed('heuristic', heuristic)
+        self.evaluate_batch = profile.timed('heuristic', heuristic.batch)
+
+    def __call__(self, state: S) -> float:
+        return self.evaluate(state)
+
+    def batch(self, states: Sequence[S]) -> Sequence[float]:
+        return self.evaluate_batch(states)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.heuristic, name)
+
+
+def unwrap_heuristic(heuristic: Heuristic[S]) -> Heuristic[S]:
+    """ returns the heuristic hidden behind the :class:`ProfiledHeuristic` and the :class:`CachedHeuristic` """
+    while isinstance(heuristic, (ProfiledHeuristic, CachedHeuristic)):
+        heuristic = heuristic.heuristic
+    return heuristic
+
+
+def effective_branching_factor(generated: int, depth: int | None, precision: float = 1e-6) -> float | None:
+    """
+    b* of the uniform tree of the solution depth with as many nodes as the search generated:
+    generated + 1 = 1 + b* + (b*)^2 + ... + (b*)^depth
+
+    >>> round(effective_branching_factor(14, 3), 3)
+    2.0
+    >>> effective_branching_factor(10, None) is None
+    True
+    """
+    if depth is None or depth <= 0 or generated <= 0:
+        return None
+
+    def tree_size(b: float) -> float:
+        return sum(b ** i for i in range(depth + 1))
+
+    # the tree has at least (b*)^depth nodes
+    low, high = 0.0, (generated + 1) ** (1 / depth)
+    while high - low > precision:
+        middle = (low + high) / 2
+        if tree_size(middle) < generated + 1:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Generator, Generic, TypeVar
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Generator, Generic, TypeVar
 from base.problem import Problem
 from base.state import State
-from tree import Node
+from tree.node import Node
+if TYPE_CHECKING:
+    from tree.profile import SearchProfile
 
 
 """
@@ -42,6 +46,43 @@ class NodeEventSubscriber(ABC, Generic[S]):
         """
 
 
+@dataclass
+class TreeStats:
+    """
+    Aggregated counters of the tree events, an alternative to counting them in a subscriber.
+    """
+    opened: int = 0
+    closed: int = 0
+
+    def reset(self) -> None:
+        self.opened = 0
+        self.closed = 0
+
+
+class _SampledSubscription(Generic[S]):
+    """ subscriber notified only every `every` events and/or every `interval` seconds """
+    __slots__ = ('subscriber', 'every', 'interval', 'next_count', 'next_time')
+
+    def __init__(self, subscriber: NodeEventSubscriber[S], every: int | None, interval: float | None):
+        self.subscriber = subscriber
+        self.every = every
+        self.interval = interval
+        self.next_count = every
+        self.next_time = perf_counter() + interval if interval is not None else None
+
+    def due(self, count: int) -> bool:
+        """ checks whether the subscriber should get the current event, schedules the next one if so """
+        due = (self.next_count is not None and count >= self.next_count) \
+            or (self.next_time is not None and perf_counter() >= self.next_time)
+        if not due:
+            return False
+        if self.every is not None:
+            self.next_count = count + self.every
+        if self.interval is not None:
+            self.next_time = perf_counter() + self.interval
+        return True
+
+
 class Tree(Generic[S]):
     """
     This class represents the search tree expanded by the algorithm.
@@ -53,31 +94,107 @@ class Tree(Generic[S]):
         root of the tree
         set up in the __init__
     subscribers: list[NodeEventSubscriber[S]]
-        objects notified by the tree about the search progress
+        objects notified by the tree about every event
+        updated by subscribe method
+    sampled: list[_SampledSubscription[S]]
+        objects notified only about some of the events
         updated by subscribe method
+    stats: TreeStats | None
+        aggregated event counters, None until enabled
+    profile: SearchProfile | None
+        per-phase timings filled by the solver, None unless profiling is enabled
+    dispatching: bool
+        whether events are dispatched at all, solvers should skip creating events if it's False
 
     Methods:
     ========
-    subscribe(subscriber: NodeEventSubscriber[S]) -> None
-        registers a new subscriber
+    subscribe(subscriber: NodeEventSubscriber[S], every: int | None = None, interval: float | None = None) -> None
+        registers a new subscriber, notified about every event or only about the sampled ones
+    enable_stats() -> TreeStats
+        starts counting the events, returns the counters
+    enable_profile(profile: SearchProfile) -> None
+        asks the solver to fill the given profile, counts the events as well
     expand(problem: problem[S, Any], node: Node[S]) -> Generator[Node[S], None, None]:
         allows to iterate over all the possible children of the given node
     """
 
     def __init__(self, root: Node[S]):
         self.root = root
-        self.subscribers: list[NodeEventSubscriber[S]] = []
+        self._init_dispatch()
 
-    def subscribe(self, subscriber: NodeEventSubscriber[S]) -> None:
+    def _init_dispatch(self) -> None:
+        self.subscribers: list[NodeEventSubscriber[S]] = []
+        self.sampled: list[_SampledSubscription[S]] = []
+        self.stats: TreeStats | None = None
+        self.profile: 'SearchProfile | None' = None
+        self.dispatching = False
 
-        self.subscribers.append(subscriber)
+    def subscribe(self, subscriber: NodeEventSubscriber[S], every: int | None = None, interval: float | None = None) -> None:
+        """
+        registers a new subscriber, by default it's notified about every event
+        if `every` (events) or `interval` (seconds) is given, it's notified only when
+        that many events happened or that much time passed since its previous notification
+        (sampled subscribers should read the totals from the `stats`)
+        """
+        if every is None and interval is None:
+            self.subscribers.append(subscriber)
+        else:
+            self.enable_stats()
+            self.sampled.append(_SampledSubscription(subscriber, every, interval))
+        self.dispatching = True
+
+    def enable_stats(self) -> TreeStats:
+        if self.stats is None:
+            self.stats = TreeStats()
+        self.dispatching = True
+        return self.stats
+
+    def enable_profile(self, profile: 'SearchProfile') -> None:
+        self.profile = profile
+        profile.stats = self.enable_stats()
 
     def _notify(self, node: Node[S], event: NodeEvent) -> None:
         """Notify subscriber about new node event"""
+        count = self._count(event)
         for subscriber in self.subscribers:
             subscriber.got_event(node, event)
+        for sampled in self.sampled:
+            if sampled.due(count):
+                sampled.subscriber.got_event(node, event)
+
+    def _notify_lazy(self, make_node: Callable[[], Node[S]], event: NodeEvent) -> None:
+        """Same as _notify, but the node is created only if some subscriber gets it"""
+        count = self._count(event)
+        node = None
+        for subscriber in self.subscribers:
+            node = node or make_node()
+            subscriber.got_event(node, event)
+        for sampled in self.sampled:
+            if sampled.due(count):
+                node = node or make_node()
+                sampled.subscriber.got_event(node, event)
+
+    def _count(self, event: NodeEvent) -> int:
+        stats = self.stats
+        if stats is None:
+            return 0
+        if event is NodeEvent.Closed:
+            stats.closed += 1
+        else:
+            stats.opened += 1
+        return stats.opened + stats.closed
 
     def expand(self, problem: Problem[S, Any], node: Node[S]) -> Generator[Node[S], None, None]:
+        if not self.dispatching:
+            for action in problem.actions(node.state):
+                yield Node(
+                    state=problem.take_action(node.state, action),
+                    parent=node,
+                    cost=node.cost + problem.action_cost(node.state, action),
+                    action=action
+                )
+            return
+
         self._notify(node, NodeEvent.Closed)
         for action in problem.actions(node.state):
             child_state = problem.take_action(node.state, action)
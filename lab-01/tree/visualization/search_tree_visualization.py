@@ -11,100 +11,115 @@ from bokeh.models import (Circle)
 from bokeh.palettes import Spectral4
 from bokeh.plotting import from_networkx, figure
 
+from base.problem import Problem
 from base.solver import Solver
+from base.state import State
 from solve import SolvingMonitor
 from tree import Node
 from tree.tree import NodeEvent
 
 silence(MISSING_RENDERERS, True)
 
+""" size of the state images shown in the tooltips """
+THUMBNAIL_SIZE = (300, 300)
+
+
+class IncrementalTreeLayout:
+    """
+    Layout of a growing tree, every new node is placed once and never moved, in O(1).
+
+    The row of a node is its depth, its column is the first free one in the row,
+    but not left to the column of its parent, so the children are drawn below or right to their parent
+    and the siblings stay next to each other.
+    """
+
+    def __init__(self):
+        self.depths: list[int] = []
+        self.columns: list[int] = []
+        self.next_free: list[int] = []
+
+    def place(self, parent: int | None) -> tuple[int, int]:
+        """ places a new node (numbered in the order of placing) and returns its (x, y) position """
+        depth = 0 if parent is None else self.depths[parent] + 1
+        if depth == len(self.next_free):
+            self.next_free.append(0)
+        column = self.next_free[depth] if parent is None else max(self.next_free[depth], self.columns[parent])
+        self.next_free[depth] = column + 1
+        self.depths.append(depth)
+        self.columns.append(column)
+        return column, -depth
+
+
+class ThumbnailCache:
+    """
+    Renders the state images (as JPEG data URIs) when they are needed for the first time,
+    every state is rendered once, no matter how many nodes show it.
+    """
+
+    def __init__(self, problem: Problem, size: tuple[int, int] = THUMBNAIL_SIZE):
+        self.problem = problem
+        self.size = size
+        self.images: dict[State, str] = {}
+
+    def __getitem__(self, state: State) -> str:
+        image = self.images.get(state)
+        if image is None:
+            buffered = BytesIO()
+            self.problem.to_image(state, self.size).convert("RGB").save(buffered, format="JPEG")
+            image = f"data:image/jpeg;base64,{base64.b64encode(buffered.getvalue()).decode('utf-8')}"
+            self.images[state] = image
+        return image
+
 
 class Visualization(SolvingMonitor):
+    """
+    Draws the search tree once the solver is done.
+
+    Solving only records the opened nodes: every node is placed by the :class:`IncrementalTreeLayout`
+    as soon as it's opened, the state images are rendered (and cached) for the tooltips just before showing the tree.
+    The parent of a node is the last drawn node with the parent's state,
+    because solvers may report the same node as different objects.
+    """
+
     def __init__(self, solver: Solver, instance: Union[str, Path]):
-        super().__init__(solver, instance)
+        super().__init__(solver, instance, interval=None)
         self.N = 0
-        self.nodes = {}
-        self.y = []
-        self.x = []
-        self.imgs = []
+        self.vertices: dict[State, int] = {}
+        self.states: list[State] = []
+        self.layout = IncrementalTreeLayout()
+        self.positions: dict[int, tuple[int, int]] = {}
+        self.thumbnails = ThumbnailCache(solver.problem)
         self.G = nx.Graph()
-        self.plot = figure(width=1300, height=600, x_range=(-10000, 10000),
-                           y_range=(-10000, 10000), tooltips=self.set_tooltips())
+        self.plot = figure(width=1300, height=600, x_range=(-1, 1),
+                           y_range=(-1, 1), tooltips=self.set_tooltips())
         self.plot.title.text = "Tree visualization"
 
     def show_results(self):
-        layout = self.hierarchy_pos(self.G, 0, x_range=(-50000, 100000), y_range=(-100000, 100000))
-        graph_renderer = from_networkx(self.G, layout, scale=1, center=layout[0])
+        if self.N == 0:
+            return
+        self.plot.x_range.start, self.plot.x_range.end = -1, max(self.layout.columns) + 1
+        self.plot.y_range.start, self.plot.y_range.end = -max(self.layout.depths) - 1, 1
+        graph_renderer = from_networkx(self.G, self.positions)
         graph_renderer.node_renderer.glyph = Circle(size=15, fill_color=Spectral4[0])
         graph_renderer.node_renderer.data_source.add(['<i>italics</i>'] * self.N, 'fonts')
-        graph_renderer.node_renderer.data_source.add(self.imgs, 'imgs')
+        graph_renderer.node_renderer.data_source.add([self.thumbnails[state] for state in self.states], 'imgs')
         self.plot.renderers.append(graph_renderer)
         show(self.plot)
 
-    def update_graph(self, node):
+    def update_graph(self, node: Node):
+        parent = self.vertices.get(node.parent.state) if node.parent is not None and self.N != 0 else None
         self.G.add_node(self.N)
-        self.nodes[node] = self.N
-
-        if self.N != 0:
-            self.G.add_edge(self.N, self.nodes[node.parent])
-        layout = self.hierarchy_pos(self.G, 0, x_range=(-50000, 100000), y_range=(-100000, 100000))
-        self.x.append(layout[self.N][0])
-        self.y.append(layout[self.N][1])
-
-        buffered = BytesIO()
-        image = self.solver.problem.to_image(node.state)
-        image.save(buffered, format="JPEG")
-        img_str = base64.b64encode(buffered.getvalue())
-        self.imgs.append(f"data:image/png;base64,{img_str.decode('utf-8')}")
+        if parent is not None:
+            self.G.add_edge(self.N, parent)
+        self.positions[self.N] = self.layout.place(parent)
+        self.vertices[node.state] = self.N
+        self.states.append(node.state)
         self.N += 1
 
     def got_event(self, node: Node, event: NodeEvent) -> None:
         if event == NodeEvent.Opened or self.N == 0:
             self.update_graph(node)
 
-    def hierarchy_pos(self, G, root, levels=None, x_range=(0, 1), y_range=(0, 1)):
-        """If there is a cycle that is reachable from root, then this will see infinite recursion.
-           G: the graph
-           root: the root node
-           levels: a dictionary
-                   key: level number (starting from 0)
-                   value: number of nodes in this level
-           width: horizontal space allocated for drawing
-           height: vertical space allocated for drawing"""
-        TOTAL = "total"
-        CURRENT = "current"
-
-        def make_levels(levels, node=root, current_level=0, parent=None):
-            """Compute the number of nodes for each level
-            """
-            if current_level not in levels:
-                levels[current_level] = {TOTAL: 0, CURRENT: 0}
-            levels[current_level][TOTAL] += 1
-            neighbors = G.neighbors(node)
-            for neighbor in neighbors:
-                if not neighbor == parent:
-                    levels = make_levels(levels, neighbor, current_level + 1, node)
-            return levels
-
-        def make_pos(pos, node=root, current_level=0, parent=None, vert_loc=0):
-
-            dx = 1 / levels[current_level][TOTAL]
-            left = dx / 2
-            pos[node] = ((left + dx * levels[current_level][CURRENT]) * x_range[1] + x_range[0], vert_loc)
-            levels[current_level][CURRENT] += 1
-            neighbors = G.neighbors(node)
-            for neighbor in neighbors:
-                if not neighbor == parent:
-                    pos = make_pos(pos, neighbor, current_level + 1, node, vert_loc - vert_gap)
-            return pos
-
-        if levels is None:
-            levels = make_levels({})
-        else:
-            levels = {l: {TOTAL: levels[l], CURRENT: 0} for l in levels}
-        vert_gap = (y_range[1] - y_range[0]) / (max([l for l in levels]) + 1)
-        return make_pos({})
-
     def set_tooltips(self):
         return """
             <div>
@@ -126,4 +141,4 @@ class Visualization(SolvingMonitor):
                     <span style="font-size: 10px; color: #696;">($x, $y)</span>
                 </div>
             </div>
-        """
\ No newline at end of file
+        """
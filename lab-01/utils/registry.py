@@ -0,0 +1,37 @@
+import importlib
+from typing import Generic, Iterator, Mapping, TypeVar
+
+
+T = TypeVar('T')
+
+
+class LazyRegistry(Mapping[str, T], Generic[T]):
+    """
+    Read-only mapping from names to objects (e.g. classes) living in modules, that are imported
+    only when the object is looked up for the first time — listing the names imports nothing.
+
+    The objects are given as "package.module:Name" paths, the names keep the given order.
+
+    >>> registry = LazyRegistry({"ordered": "collections:OrderedDict"})
+    >>> list(registry)
+    ['ordered']
+    >>> registry["ordered"].__name__
+    'OrderedDict'
+    """
+
+    def __init__(self, paths: dict[str, str]):
+        self.paths = paths
+        self.loaded: dict[str, T] = {}
+
+    def __getitem__(self, name: str) -> T:
+        loaded = self.loaded.get(name)
+        if loaded is None:
+            module, _, attribute = self.paths[name].partition(':')
+            loaded = self.loaded[name] = getattr(importlib.import_module(module), attribute)
+        return loaded
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)